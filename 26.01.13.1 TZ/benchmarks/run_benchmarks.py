@@ -0,0 +1,469 @@
+"""
+Замеры производительности File Renamer
+
+Запуск: python benchmarks/run_benchmarks.py [имя ...]
+Без аргументов выполняются все замеры, которым не нужны входные данные;
+benchmark_readers и benchmark_file_orders принимают путь:
+    python benchmarks/run_benchmarks.py readers=таблица.xlsx file_orders=папка
+"""
+
+import gc
+import importlib.util
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from renamer_gui_v13_unified import (  # noqa: E402
+    DIR_FD_RENAME, FILE_ORDERS, FileRenamer, OperationPlanner, TableAnalyzer,
+    get_available_readers, plan_duplicate_numbers, sanitize_filename, undo_run
+)
+
+def benchmark_readers(table_path: str) -> Dict[str, Dict[str, float]]:
+    """
+    Замеряет скорость и пиковую память каждого доступного движка
+
+    Пиковая память считается через tracemalloc и учитывает только
+    Python-аллокации (память внутри calamine не видна).
+
+    Args:
+        table_path: Путь к таблице Excel
+
+    Returns:
+        {движок: {'rows', 'seconds', 'rows_per_sec', 'peak_mb'}}
+    """
+    path = Path(table_path)
+    results = {}
+
+    for reader in get_available_readers(path):
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            rows = sum(1 for _ in reader.iter_column(path))
+        finally:
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        results[reader.name] = {
+            'rows': rows,
+            'seconds': elapsed,
+            'rows_per_sec': rows / elapsed if elapsed > 0 else float('inf'),
+            'peak_mb': peak / (1024 * 1024)
+        }
+        logging.info(
+            f"Движок {reader.name}: {rows} строк за {elapsed:.2f} с "
+            f"({results[reader.name]['rows_per_sec']:.0f} строк/с), "
+            f"пик памяти {results[reader.name]['peak_mb']:.1f} MB"
+        )
+
+    return results
+
+def benchmark_table_analyzer(count: int = 1_000_000) -> Dict[str, float]:
+    """
+    Сравнивает TableAnalyzer с прежним многопроходным анализом
+
+    Столбец из count значений: 5% пустых, 5% пробельных, числа и повторяющиеся
+    имена. Прежний анализ (analyze_content + get_valid_names) повторен как
+    был: dropna/astype/str.strip дважды, apply(sanitize_filename), Counter
+    и set. Без pandas те же проходы выполняются на списках.
+
+    Returns:
+        {'single_pass_seconds', 'multi_pass_seconds', 'speedup'}
+    """
+    values: List[Any] = []
+    for i in range(count):
+        if i % 20 == 0:
+            values.append(None)
+        elif i % 20 == 1:
+            values.append('   ')
+        elif i % 20 == 2:
+            values.append(i)
+        else:
+            values.append(f" name {i % (count // 4 or 1)} ")
+
+    gc.collect()
+    started = time.perf_counter()
+    analyzer = TableAnalyzer(keep_names=True)
+    analyzer.feed(values)
+    result = analyzer.result()
+    single_pass_seconds = time.perf_counter() - started
+
+    if importlib.util.find_spec('pandas') is not None:
+        import pandas as pd
+
+        series = pd.Series(values, dtype=object)
+        gc.collect()
+        started = time.perf_counter()
+        empty_nan = int(series.isna().sum())
+        whitespace_only = int((series.dropna().astype(str).str.strip() == '').sum())
+        stripped = series.dropna().astype(str).str.strip()
+        valid = stripped[stripped != ''].apply(sanitize_filename)
+        name_counts = Counter(valid.tolist())
+        unique_names = len(set(valid))
+        multi_pass_seconds = time.perf_counter() - started
+        baseline = 'pandas'
+    else:
+        gc.collect()
+        started = time.perf_counter()
+        non_empty = [value for value in values if value is not None]
+        empty_nan = len(values) - len(non_empty)
+        stripped = [str(value).strip() for value in non_empty]
+        whitespace_only = stripped.count('')
+        valid = [sanitize_filename(name) for name in stripped if name]
+        name_counts = Counter(valid)
+        unique_names = len(set(valid))
+        multi_pass_seconds = time.perf_counter() - started
+        baseline = 'списки'
+
+    same = (
+        (result['empty_nan'], result['whitespace_only'], result['valid_count'],
+         result['unique_names'], len(result['duplicates_original']))
+        == (empty_nan, whitespace_only, len(valid), unique_names,
+            sum(1 for n in name_counts.values() if n > 1))
+    )
+    results = {
+        'single_pass_seconds': single_pass_seconds,
+        'multi_pass_seconds': multi_pass_seconds,
+        'speedup': multi_pass_seconds / single_pass_seconds
+    }
+    logging.info(
+        f"Анализ {count} строк (итоги {'совпадают' if same else 'РАСХОДЯТСЯ'}): "
+        f"за один проход {single_pass_seconds:.2f} с, "
+        f"прежними проходами ({baseline}) {multi_pass_seconds:.2f} с "
+        f"(ускорение x{results['speedup']:.1f})"
+    )
+    return results
+
+# Допустимое отношение наибольшего времени на имя к наименьшему между
+# размерами benchmark_planner (шум таймера и кэшей, но не квадратичный рост)
+PLANNER_LINEAR_RATIO = 2.0
+
+def benchmark_planner(sizes: Iterable[int] = (25_000, 50_000, 100_000)) -> Dict[int, float]:
+    """
+    Стресс-тест планировщика на таблице из одинаковых имен
+
+    Папка (снимок, диск не используется): size файлов f{i}.txt и size/10
+    файлов "dup (n)_TZ.txt", оставшихся от прошлого запуска. Таблица -
+    size имен "dup": первые size/10 дубликатов упираются в эти файлы и
+    помечаются ошибкой. Результат проверяется по числу ошибок, а рост
+    времени - по отношению времени на имя между размерами (не больше
+    PLANNER_LINEAR_RATIO).
+
+    Returns:
+        {size: секунды}
+    """
+    results = {}
+    for size in sizes:
+        occupied = size // 10
+        files = [Path(f"f{i}.txt") for i in range(size)]
+        existing = [path.name for path in files]
+        existing += [f"dup ({n})_TZ.txt" for n in range(1, occupied + 1)]
+        names = ["dup"] * size
+
+        planner = OperationPlanner(Path('.'), existing_names=existing)
+        started = time.perf_counter()
+        table = planner.plan_many(1, files, names)
+        elapsed = time.perf_counter() - started
+
+        results[size] = elapsed
+        correct = table.count('error') == occupied and table.count('pending') == size - occupied
+        logging.info(
+            f"Планировщик: {size} имен за {elapsed:.2f} с "
+            f"({elapsed / size * 1e6:.1f} мкс/имя), "
+            f"занято {table.count('error')} из {occupied}, "
+            f"результат {'верен' if correct else 'НЕВЕРЕН'}"
+        )
+
+    per_name = [results[size] / size for size in results]
+    if len(per_name) > 1:
+        ratio = max(per_name) / min(per_name)
+        logging.info(
+            f"Планировщик: время на имя меняется в {ratio:.2f} раза между размерами, "
+            f"рост {'линейный' if ratio <= PLANNER_LINEAR_RATIO else 'НЕЛИНЕЙНЫЙ'}"
+        )
+
+    return results
+
+def benchmark_duplicate_numbers(count: int = 1_000_000) -> Dict[str, float]:
+    """
+    Сравнивает plan_duplicate_numbers с прежним построчным циклом
+
+    Прежний цикл prepare_operations: re.sub с некомпилированным шаблоном на
+    каждой строке (как в прежнем extract_base_name) и defaultdict-счетчик.
+    Имена: count строк, четверть повторяется, каждая десятая уже с номером "(n)".
+
+    Returns:
+        {'batch_seconds', 'loop_seconds', 'speedup'}
+    """
+    names = [
+        f"name {i % (count // 4 or 1)} ({i % 7})" if i % 10 == 0 else f"name {i % (count // 4 or 1)}"
+        for i in range(count)
+    ]
+
+    gc.collect()
+    started = time.perf_counter()
+    bases, occurrences = plan_duplicate_numbers(names)
+    batch_seconds = time.perf_counter() - started
+
+    gc.collect()
+    started = time.perf_counter()
+    base_name_counter = defaultdict(int)
+    loop_bases = []
+    loop_occurrences = []
+    for original_name in names:
+        base_name = re.sub(r'\s*\(\d+\)$', '', str(original_name)).strip()
+        base_name_counter[base_name] += 1
+        loop_bases.append(base_name)
+        loop_occurrences.append(base_name_counter[base_name])
+    loop_seconds = time.perf_counter() - started
+
+    same = bases == loop_bases and occurrences == loop_occurrences
+    results = {
+        'batch_seconds': batch_seconds,
+        'loop_seconds': loop_seconds,
+        'speedup': loop_seconds / batch_seconds
+    }
+    logging.info(
+        f"Номера дубликатов для {count} имен (итоги {'совпадают' if same else 'РАСХОДЯТСЯ'}): "
+        f"пакетно {batch_seconds:.2f} с, построчно {loop_seconds:.2f} с "
+        f"(ускорение x{results['speedup']:.1f})"
+    )
+    return results
+
+def benchmark_operation_table(count: int = 1_000_000) -> Dict[str, float]:
+    """
+    Замеряет память плана и скорость выборок по статусу
+
+    План из count операций строится планировщиком без обращений к диску;
+    1% операций помечается ошибкой. Память считается через tracemalloc
+    (имена файлов входят в расчет).
+
+    Returns:
+        {'bytes_per_operation', 'plan_seconds', 'query_seconds'}
+    """
+    files = [Path(f"file_{i:07d}.mp4") for i in range(count)]
+    names = [f"name {i % (count // 4 or 1)}" for i in range(count)]
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    table = OperationPlanner(Path('.')).plan_many(1, files, names)
+    plan_seconds = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    for row in range(0, count, 100):
+        table.set_status(row, 'error')
+
+    gc.collect()  # отложенная полная сборка мусора не должна попасть в замер
+    started = time.perf_counter()
+    errors = table.by_status('error')
+    pending = table.count('pending')
+    query_seconds = time.perf_counter() - started
+
+    results = {
+        'bytes_per_operation': current / count,
+        'plan_seconds': plan_seconds,
+        'query_seconds': query_seconds
+    }
+    logging.info(
+        f"План {count} операций: {results['bytes_per_operation']:.0f} байт/операцию, "
+        f"построение {plan_seconds:.2f} с, выборка {len(errors)} ошибок "
+        f"и подсчет {pending} ожидающих за {query_seconds * 1000:.1f} мс"
+    )
+    return results
+
+def benchmark_file_orders(folder_path: str,
+                          orders: Iterable[str] = tuple(FILE_ORDERS)) -> Dict[str, Dict[str, float]]:
+    """
+    Замеряет загрузку папки (scandir, ключи, сортировка) для каждого порядка
+
+    Returns:
+        {порядок: {'entries', 'seconds', 'entries_per_sec'}}
+    """
+    results = {}
+    for order in orders:
+        started = time.perf_counter()
+        renamer = FileRenamer(folder_path, dry_run=True, order=order)
+        elapsed = time.perf_counter() - started
+
+        entries = len(renamer.files)
+        results[order] = {
+            'entries': entries,
+            'seconds': elapsed,
+            'entries_per_sec': entries / elapsed if elapsed > 0 else float('inf')
+        }
+        logging.info(
+            f"Порядок {order}: {entries} файлов за {elapsed:.2f} с "
+            f"({results[order]['entries_per_sec']:.0f} файлов/с)"
+        )
+
+    return results
+
+def benchmark_dir_fd_rename(depth: int = 40, count: int = 20_000) -> Dict[str, float]:
+    """
+    Сравнивает переименования по полному пути и относительно дескриптора
+
+    Файл в папке глубины depth переименовывается туда и обратно count раз
+    каждым способом.
+
+    Returns:
+        {'path': вызовов/с, 'dir_fd': вызовов/с}
+    """
+    if not DIR_FD_RENAME:
+        logging.info("rename с dir_fd не поддерживается на этой платформе")
+        return {}
+
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        folder = Path(root, *(f"level_{i:02d}" for i in range(depth)))
+        folder.mkdir(parents=True)
+        Path(folder, 'a.txt').touch()
+        names = ('a.txt', 'b.txt')
+
+        started = time.perf_counter()
+        for i in range(count):
+            os.rename(folder / names[i % 2], folder / names[1 - i % 2])
+        results['path'] = count / (time.perf_counter() - started)
+
+        fd = os.open(folder, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+        try:
+            started = time.perf_counter()
+            for i in range(count):
+                os.rename(names[i % 2], names[1 - i % 2], src_dir_fd=fd, dst_dir_fd=fd)
+            results['dir_fd'] = count / (time.perf_counter() - started)
+        finally:
+            os.close(fd)
+
+    logging.info(
+        f"Переименование на глубине {depth} ({len(str(folder))} символов пути): "
+        f"по пути {results['path']:.0f} вызовов/с, "
+        f"через dir_fd {results['dir_fd']:.0f} вызовов/с"
+    )
+    return results
+
+class _LatencyRenamer(FileRenamer):
+    """FileRenamer с задержкой перед каждым переименованием (имитация SMB/NFS)"""
+
+    latency = 0.0
+
+    def _rename(self, source: str, target: str) -> None:
+        time.sleep(self.latency)
+        super()._rename(source, target)
+
+def benchmark_executor(count: int = 500, latency: float = 0.005,
+                       workers: Iterable[int] = (1, 8, 32)) -> Dict[int, float]:
+    """
+    Замеряет выполнение плана при задержке файловой системы
+
+    Во временной папке создается count файлов, таблица меняет их имена
+    попарно - каждая пара становится циклом из трех шагов, так что замер
+    включает и зависимые переименования. Результат проверяется по
+    содержимому файлов.
+
+    Returns:
+        {число потоков: секунды}
+    """
+    count -= count % 2
+    results = {}
+
+    for worker_count in workers:
+        with tempfile.TemporaryDirectory() as folder:
+            for i in range(count):
+                Path(folder, f"{i:06d}_TZ.txt").write_text(str(i))
+
+            renamer = _LatencyRenamer(folder)
+            renamer.latency = latency
+            renamer.prepare_operations([f"{i ^ 1:06d}" for i in range(count)])
+
+            started = time.perf_counter()
+            stats = renamer.execute_operations(workers=worker_count)
+            results[worker_count] = time.perf_counter() - started
+
+            swapped = all(
+                Path(folder, f"{i ^ 1:06d}_TZ.txt").read_text() == str(i)
+                for i in range(count)
+            )
+            logging.info(
+                f"Выполнение {count} операций, задержка {latency * 1000:.0f} мс, "
+                f"потоков {worker_count}: {results[worker_count]:.2f} с "
+                f"({count / results[worker_count]:.0f} операций/с), "
+                f"успешно {stats['success']}, результат {'верен' if swapped else 'НЕВЕРЕН'}"
+            )
+
+    return results
+
+def benchmark_undo(count: int = 100_000, workers: int = 16) -> Dict[str, float]:
+    """
+    Сравнивает время запуска и его отмены
+
+    Во временной папке count файлов переименовываются по таблице, затем
+    запуск отменяется по своему журналу (журналы включены в CONFIG).
+
+    Returns:
+        {'run_seconds', 'undo_seconds'}
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        for i in range(count):
+            Path(folder, f"file_{i:07d}.txt").touch()
+
+        renamer = FileRenamer(folder)
+        renamer.prepare_operations([f"name {i}" for i in range(count)])
+        started = time.perf_counter()
+        renamer.execute_operations(workers)
+        results['run_seconds'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        undo, stats = undo_run(renamer.last_journal, workers=workers)
+        results['undo_seconds'] = time.perf_counter() - started
+
+        restored = all(Path(folder, f"file_{i:07d}.txt").exists() for i in range(count))
+
+    logging.info(
+        f"{count} переименований: запуск {results['run_seconds']:.2f} с, "
+        f"отмена {results['undo_seconds']:.2f} с (успешно {stats['success']}, "
+        f"имена {'восстановлены' if restored else 'НЕ восстановлены'})"
+    )
+    return results
+
+
+BENCHMARKS = {
+    'readers': benchmark_readers,
+    'table_analyzer': benchmark_table_analyzer,
+    'planner': benchmark_planner,
+    'duplicate_numbers': benchmark_duplicate_numbers,
+    'operation_table': benchmark_operation_table,
+    'file_orders': benchmark_file_orders,
+    'dir_fd_rename': benchmark_dir_fd_rename,
+    'executor': benchmark_executor,
+    'undo': benchmark_undo
+}
+
+# Замеры, которым нужен путь к таблице или папке
+NEEDS_PATH = ('readers', 'file_orders')
+
+def main(argv: List[str]) -> None:
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    selected = argv or [name for name in BENCHMARKS if name not in NEEDS_PATH]
+    for spec in selected:
+        name, _, path = spec.partition('=')
+        if name not in BENCHMARKS:
+            raise SystemExit(f"Неизвестный замер: {name}. Доступны: {', '.join(BENCHMARKS)}")
+        if name in NEEDS_PATH:
+            if not path:
+                raise SystemExit(f"Замеру {name} нужен путь: {name}=путь")
+            BENCHMARKS[name](path)
+        else:
+            BENCHMARKS[name]()
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -20,19 +20,31 @@ from pathlib import Path
 from datetime import datetime
 import logging
 from logging.handlers import RotatingFileHandler
-from typing import Optional, Dict, List, Any, Tuple
+from typing import (Optional, Dict, List, Any, Tuple, Iterator, Iterable, Union, Callable,
+                    AsyncIterator)
 import re
+import csv
+import io
+import codecs
+import json
+import struct
+import zlib
+import hashlib
+import zipfile
+from xml.etree import ElementTree
+import time
+import importlib.util
 from collections import defaultdict, Counter
-from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice, chain, compress
+from array import array
+from dataclasses import dataclass, field
 import threading
-
-# Проверка pandas
-try:
-    import pandas as pd
-except ImportError:
-    print("Ошибка: Не установлена библиотека pandas")
-    print("Установите: pip install pandas openpyxl")
-    sys.exit(1)
+from contextlib import contextmanager
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import platform
+import unicodedata
 
 # ============================================================================
 # КОНФИГУРАЦИЯ
@@ -42,7 +54,7 @@ CONFIG = {
     # Настройки окна
     'window': {
         'width': 750,
-        'height': 600,
+        'height': 765,
         'title': 'Переименование файлов по таблице v13.1.0',
         'resizable': False
     },
@@ -85,6 +97,101 @@ CONFIG = {
         ('All files', '*.*')
     ],
 
+    # Сохраненные планы переименования (JSON Lines)
+    'plan_formats': [
+        ('Rename plans', '*.jsonl'),
+        ('All files', '*.*')
+    ],
+
+    # Журналы выполнения (JSON Lines)
+    'journal_formats': [
+        ('Run journals', '*.jsonl'),
+        ('All files', '*.*')
+    ],
+
+    # Движки чтения Excel: 'auto' выбирает самый быстрый из установленных
+    'table_reader': {
+        'engine': 'auto',
+        'priority': ['calamine', 'openpyxl', 'pandas']
+    },
+
+    # Определение формата CSV по начальному фрагменту файла
+    'csv': {
+        'sample_bytes': 64 * 1024,
+        'fallback_encodings': ['cp1251'],
+        'delimiters': ',;\t|'
+    },
+
+    # Автоопределение строки заголовка
+    'header_detection': {
+        'sample_rows': 10,
+        'keywords': [
+            'название', 'имя', 'имя файла', 'имена файлов', 'новое имя', 'заголовок',
+            'name', 'names', 'filename', 'file name', 'new name', 'title', 'header'
+        ]
+    },
+
+    # Кэш разобранных таблиц на диске
+    'table_cache': {
+        'enabled': True,
+        'dir': 'table_cache',
+        'max_bytes': 256 * 1024 * 1024  # 256 MB
+    },
+
+    # Потоковый конвейер таблица -> план -> переименование
+    'pipeline': {
+        'chunk_size': 5000
+    },
+
+    # Выполнение плана: потоков на папку (1 - последовательно). На сетевых
+    # дисках (SMB/NFS) каждое переименование ждет ответа сервера, там
+    # полезно 16-32
+    'execution': {
+        'workers': 1,
+        'dir_fd': True,     # переименование относительно дескриптора папки (Linux)
+        'async_limit': 16   # одновременных цепочек в execute_async
+    },
+
+    # Журнал выполнения: намерения и исходы переименований для
+    # восстановления после сбоя. Исходы сбрасываются на диск группой -
+    # каждые group_size записей или раз в group_ms миллисекунд
+    'journal': {
+        'enabled': True,
+        'directory': 'journals',
+        'group_size': 512,
+        'group_ms': 50,
+        'keep': 50,         # завершенных журналов хранится
+        # (size, mtime_ns) файлов для проверки при отмене - из чтения папки,
+        # без stat после каждого переименования
+        'stamps': True
+    },
+
+    # Отмена запуска по журналу: потоков выполнения
+    'undo': {
+        'workers': 16
+    },
+
+    # Сравнение имен при проверке коллизий: 'auto' - по файловой системе папки,
+    # 'exact' - посимвольно, 'casefold' - без учета регистра и формы Unicode
+    'collision_keys': {
+        'mode': 'auto',
+        'case_insensitive_fs': [
+            'cifs', 'smb3', 'smbfs', 'ntfs', 'ntfs3', 'fuseblk', 'vfat', 'msdos', 'exfat'
+        ]
+    },
+
+    # Рекурсивный режим: потоки обхода/обработки папок и сопоставление
+    # таблицы ('global' - одна таблица на все дерево, 'per_directory' -
+    # каждая папка с первой строки таблицы)
+    'recursive': {
+        'workers': 16,
+        'mapping': 'global'
+    },
+
+    # Порядок файлов папки: 'name', 'natural', 'locale', 'mtime', 'size'
+    # (см. FILE_ORDERS)
+    'file_order': 'name',
+
     # Недопустимые символы в именах файлов (Windows)
     'invalid_chars': '<>:"/\\|?*',
 
@@ -122,12 +229,25 @@ class InvalidFileNameError(FileRenamerError):
     """Недопустимое имя файла"""
     pass
 
+class PlanError(FileRenamerError):
+    """Файл плана поврежден или имеет неизвестный формат"""
+    pass
+
+class JournalError(FileRenamerError):
+    """Журнал выполнения поврежден или имеет неизвестный формат"""
+    pass
+
 # ============================================================================
 # УТИЛИТЫ
 # ============================================================================
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=8)
+def _invalid_chars_table(invalid_chars: str) -> Dict[int, str]:
+    """Таблица str.translate для замены недопустимых символов на '_'"""
+    return str.maketrans({char: '_' for char in invalid_chars})
+
 def sanitize_filename(name: str) -> str:
     """
     Удаляет недопустимые символы из имени файла
@@ -141,23 +261,54 @@ def sanitize_filename(name: str) -> str:
     if not name or not isinstance(name, str):
         raise InvalidFileNameError("Имя файла не может быть пустым")
 
-    # Удаляем недопустимые символы
-    invalid_chars = CONFIG['invalid_chars']
-    sanitized = name
-    for char in invalid_chars:
-        sanitized = sanitized.replace(char, '_')
-
-    # Удаляем лишние пробелы
-    sanitized = sanitized.strip()
-
-    # Удаляем точки в конце (Windows не позволяет)
-    sanitized = sanitized.rstrip('.')
+    # Заменяем недопустимые символы, удаляем лишние пробелы
+    # и точки в конце (Windows не позволяет)
+    sanitized = name.translate(_invalid_chars_table(CONFIG['invalid_chars'])).strip().rstrip('.')
 
     if not sanitized:
         raise InvalidFileNameError(f"Имя файла '{name}' содержит только недопустимые символы")
 
     return sanitized
 
+def sanitize_many(names: List[str]) -> Tuple[List[str], List[Tuple[int, str]]]:
+    """
+    Пакетная санитизация имен
+
+    Ошибка в одной строке не отменяет очистку остальных: такие строки
+    исключаются из результата и возвращаются отдельным списком.
+
+    Args:
+        names: Исходные имена
+
+    Returns:
+        (очищенные имена, [(индекс в names, причина отказа), ...])
+    """
+    table = _invalid_chars_table(CONFIG['invalid_chars'])
+    try:
+        sanitized = [name.translate(table).strip().rstrip('.') for name in names]
+    except (AttributeError, TypeError):
+        # Во входных данных есть не строки - медленный путь с проверкой каждой
+        sanitized = [
+            name.translate(table).strip().rstrip('.') if isinstance(name, str) else ''
+            for name in names
+        ]
+
+    if all(sanitized):
+        return sanitized, []
+
+    rejected = []
+    for index, name in enumerate(sanitized):
+        if not name:
+            source = names[index]
+            if not source or not isinstance(source, str):
+                rejected.append((index, "Имя файла не может быть пустым"))
+            else:
+                rejected.append((index, f"Имя файла '{source}' содержит только недопустимые символы"))
+
+    return [name for name in sanitized if name], rejected
+
+_NUMBER_SUFFIX_RE = re.compile(r'\s*\(\d+\)$')
+
 def extract_base_name(name: str) -> str:
     """
     Извлекает базовое имя, удаляя существующий номер в скобках
@@ -169,10 +320,105 @@ def extract_base_name(name: str) -> str:
         Базовое имя без номера
     """
     # Удаляем номер в скобках в конце строки
-    pattern = r'\s*\(\d+\)$'
-    base_name = re.sub(pattern, '', str(name))
+    base_name = _NUMBER_SUFFIX_RE.sub('', str(name))
     return base_name.strip()
 
+def plan_duplicate_numbers(names: List[str],
+                           counter: Optional[Dict[str, int]] = None,
+                           key: Optional[Callable[[str], str]] = None) -> Tuple[List[str], List[int]]:
+    """
+    Пакетно вычисляет базовые имена и номер вхождения каждого из них
+
+    Аналог groupby(base).cumcount() + 1: первое вхождение базового имени
+    получает 1, следующие - 2, 3, ... (номер дубликата = вхождение - 1).
+
+    Args:
+        names: Имена из таблицы (строки)
+        counter: Счетчики вхождений предыдущих порций (обновляется)
+        key: Ключ сравнения базовых имен (см. get_collision_key)
+
+    Returns:
+        (базовые имена, номера вхождений)
+    """
+    sub = _NUMBER_SUFFIX_RE.sub
+    # Регулярное выражение нужно только именам со скобкой
+    bases = [sub('', name).strip() if ')' in name else name.strip() for name in names]
+
+    if counter is None:
+        counter = {}
+    counts_get = counter.get
+    occurrences = []
+    occurrences_append = occurrences.append
+    for base_key in (bases if key is None else map(key, bases)):
+        occurrence = counts_get(base_key, 0) + 1
+        counter[base_key] = occurrence
+        occurrences_append(occurrence)
+
+    return bases, occurrences
+
+# rename относительно дескриптора папки (renameat): есть на Linux/BSD/macOS
+DIR_FD_RENAME = os.rename in os.supports_dir_fd
+
+def casefold_key(name: str) -> str:
+    """
+    Ключ имени для файловых систем без учета регистра (NTFS, SMB, APFS)
+
+    Каноническое сравнение без регистра: "Video" и "video", а также формы
+    NFC и NFD одного кириллического имени ("й" = "и" + U+0306) дают один ключ.
+    """
+    return unicodedata.normalize('NFC', unicodedata.normalize('NFD', name).casefold())
+
+def _mount_fstype(path: Path) -> Optional[str]:
+    """Тип файловой системы, на которой лежит path (по /proc/mounts)"""
+    try:
+        with open('/proc/mounts', encoding='utf-8', errors='replace') as mounts:
+            lines = mounts.readlines()
+    except OSError:
+        return None
+
+    target = str(path.resolve())
+    best_mount, best_type = '', None
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 3:
+            continue
+        # Пробелы в точках монтирования экранированы как \040
+        mount_point = fields[1].replace('\\040', ' ')
+        prefix = mount_point.rstrip('/') + '/'
+        if (target == mount_point or target.startswith(prefix)) and len(mount_point) > len(best_mount):
+            best_mount, best_type = mount_point, fields[2]
+    return best_type
+
+def is_case_insensitive_fs(path: Path) -> bool:
+    """Определяет, сравнивает ли файловая система папки имена без регистра"""
+    if os.name == 'nt' or sys.platform == 'darwin':
+        return True
+    fstype = _mount_fstype(Path(path))
+    return fstype in CONFIG['collision_keys']['case_insensitive_fs']
+
+def get_collision_key(path: Path, mode: Optional[str] = None) -> Optional[Callable[[str], str]]:
+    """
+    Выбирает функцию ключа имени для проверки коллизий в папке
+
+    Args:
+        path: Папка с файлами
+        mode: 'auto', 'exact' или 'casefold' (по умолчанию из CONFIG)
+
+    Returns:
+        casefold_key или None (имена сравниваются посимвольно)
+    """
+    mode = mode or CONFIG['collision_keys']['mode']
+    if mode == 'auto':
+        mode = 'casefold' if is_case_insensitive_fs(path) else 'exact'
+    if mode == 'casefold':
+        return casefold_key
+    if mode == 'exact':
+        return None
+    raise ValueError(f"Неизвестный режим сравнения имен: {mode}")
+
+def _exact_key(name: str) -> str:
+    return name
+
 def format_size(bytes_size: int) -> str:
     """Форматирует размер в человекочитаемый вид"""
     for unit in ['B', 'KB', 'MB', 'GB']:
@@ -181,17 +427,713 @@ def format_size(bytes_size: int) -> str:
         bytes_size /= 1024.0
     return f"{bytes_size:.1f} TB"
 
+# ============================================================================
+# ЧТЕНИЕ ТАБЛИЦ
+# ============================================================================
+
+def _normalize_cell(value: Any) -> Any:
+    """
+    Приводит значение ячейки к единому виду для всех движков
+
+    Пустые ячейки и строки из одних пробелов -> None, целые числа с
+    плавающей точкой -> int (как это делает pandas при чтении Excel).
+    calamine по правилам XML отбрасывает пробелы без xml:space="preserve",
+    поэтому пробельные ячейки считаются пустыми во всех движках.
+    """
+    if value is None:
+        return None
+    if value.__class__ is str:
+        return value if value.strip() else None
+    if isinstance(value, float):
+        if value != value:  # NaN
+            return None
+        if value.is_integer():
+            return int(value)
+    return value
+
+def parse_column_spec(spec: Union[int, str, None]) -> Union[int, str]:
+    """
+    Разбирает выбор столбца
+
+    Args:
+        spec: int - индекс с нуля; строка из цифр - номер с единицы ('4');
+              латинские буквы - буква столбца ('D'); иначе - текст заголовка
+
+    Returns:
+        Индекс столбца с нуля или текст заголовка
+    """
+    if spec is None:
+        return 0
+    if isinstance(spec, int):
+        if spec < 0:
+            raise TableError(f"Недопустимый номер столбца: {spec}")
+        return spec
+
+    text = spec.strip()
+    if not text:
+        return 0
+    if text.isdigit():
+        if int(text) < 1:
+            raise TableError(f"Недопустимый номер столбца: {text}")
+        return int(text) - 1
+    if re.fullmatch(r'[A-Za-z]{1,3}', text):
+        index = 0
+        for char in text.upper():
+            index = index * 26 + (ord(char) - ord('A') + 1)
+        return index - 1
+    return text
+
+def _find_header_column(header_row: Iterable[Any], title: str) -> int:
+    """Ищет столбец по тексту заголовка в первой строке (без учета регистра)"""
+    wanted = title.strip().casefold()
+    for index, value in enumerate(header_row):
+        if value is not None and str(value).strip().casefold() == wanted:
+            return index
+    raise TableError(f"Столбец с заголовком '{title}' не найден в первой строке")
+
+def list_sheets(table_path: str) -> List[str]:
+    """
+    Возвращает имена листов книги по метаданным, не читая ячейки
+
+    Для .xlsx/.xlsm разбирается только xl/workbook.xml внутри архива.
+    Для CSV возвращается пустой список.
+    """
+    path = Path(table_path)
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        return []
+
+    if suffix in ('.xlsx', '.xlsm'):
+        try:
+            with zipfile.ZipFile(path) as archive:
+                with archive.open('xl/workbook.xml') as workbook_xml:
+                    return [
+                        element.get('name')
+                        for _, element in ElementTree.iterparse(workbook_xml)
+                        if element.tag.rsplit('}', 1)[-1] == 'sheet'
+                    ]
+        except (KeyError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+            raise TableError(f"Не удалось прочитать список листов: {str(e)}")
+
+    if CalamineReader.is_available():
+        from python_calamine import CalamineWorkbook
+        return list(CalamineWorkbook.from_path(str(path)).sheet_names)
+
+    if PandasReader.is_available():
+        import pandas as pd
+        return list(pd.ExcelFile(path).sheet_names)
+
+    raise TableError(f"Нет установленного движка для формата {path.suffix}")
+
+_EXTENSION_RE = re.compile(r'\.[A-Za-z0-9]{1,5}$')
+
+def detect_header(sample: List[Any]) -> bool:
+    """
+    Определяет, является ли первая строка заголовком
+
+    Эвристики (по первым строкам столбца):
+    1. Первая ячейка совпадает с типичным названием столбца
+    2. Данные похожи на имена файлов с расширением, а первая ячейка - нет
+    3. Данные - числа, а первая ячейка - текст
+
+    Args:
+        sample: Первые значения столбца (CONFIG['header_detection']['sample_rows'])
+
+    Returns:
+        True, если первая строка - заголовок
+    """
+    if not sample or sample[0] is None:
+        return False
+
+    first = str(sample[0]).strip()
+    if first.casefold().rstrip(':').strip() in CONFIG['header_detection']['keywords']:
+        return True
+
+    rest = [value for value in sample[1:] if value is not None]
+    if not rest:
+        return False
+
+    threshold = len(rest) * 0.8
+
+    with_extension = sum(1 for value in rest if _EXTENSION_RE.search(str(value).strip()))
+    if with_extension >= threshold and not _EXTENSION_RE.search(first):
+        return True
+
+    numeric = sum(1 for value in rest if isinstance(value, (int, float)) or str(value).strip().isdigit())
+    if numeric >= threshold and not isinstance(sample[0], (int, float)) and not first.isdigit():
+        return True
+
+    return False
+
+def split_header(values: Iterable[Any],
+                 has_header: Optional[bool] = None) -> Tuple[bool, Any, Iterator[Any]]:
+    """
+    Отделяет строку заголовка от потока значений без повторного чтения
+
+    Первые строки берутся из того же итератора и возвращаются обратно в поток.
+
+    Args:
+        values: Поток значений столбца
+        has_header: True/False - принудительно, None - автоопределение
+
+    Returns:
+        (есть ли заголовок, значение заголовка или None, поток данных)
+    """
+    values = iter(values)
+    sample = list(islice(values, CONFIG['header_detection']['sample_rows']))
+
+    if has_header is None:
+        has_header = detect_header(sample)
+
+    header = None
+    if has_header and sample:
+        header = sample.pop(0)
+
+    return has_header, header, chain(sample, values)
+
+class TableReader:
+    """Базовый движок потокового чтения одного столбца таблицы"""
+
+    name = 'base'
+    module = ''
+    extensions: Tuple[str, ...] = ()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Проверяет, установлена ли библиотека движка (без импорта)"""
+        return importlib.util.find_spec(cls.module) is not None
+
+    @classmethod
+    def supports(cls, path: Path) -> bool:
+        """Проверяет, умеет ли движок читать файл с таким расширением"""
+        return path.suffix.lower() in cls.extensions
+
+    def iter_column(self, path: Path, sheet: Union[int, str, None] = None,
+                    column: Union[int, str] = 0) -> Iterator[Any]:
+        """
+        Построчно возвращает значения одного столбца
+
+        Args:
+            path: Путь к таблице
+            sheet: Индекс (с нуля) или имя листа, None - первый лист
+            column: Индекс столбца с нуля или текст заголовка в первой строке
+                    (строка заголовка в результат не попадает)
+        """
+        raise NotImplementedError
+
+class CalamineReader(TableReader):
+    """Движок на python-calamine (Rust), самый быстрый"""
+
+    name = 'calamine'
+    module = 'python_calamine'
+    extensions = ('.xlsx', '.xlsm', '.xlsb', '.xls', '.ods')
+
+    def iter_column(self, path: Path, sheet: Union[int, str, None] = None,
+                    column: Union[int, str] = 0) -> Iterator[Any]:
+        from python_calamine import CalamineWorkbook
+
+        workbook = CalamineWorkbook.from_path(str(path))
+        if isinstance(sheet, str):
+            worksheet = workbook.get_sheet_by_name(sheet)
+        else:
+            worksheet = workbook.get_sheet_by_index(sheet or 0)
+
+        # iter_rows() отдает строки с первой, но столбцы - начиная с первого
+        # непустого (start[1]), а не с A: индекс столбца сдвигается
+        first_col = (worksheet.start or (0, 0))[1]
+        rows = worksheet.iter_rows()
+
+        if isinstance(column, str):
+            header_row = [None] * first_col + [_normalize_cell(v) for v in next(rows, [])]
+            column = _find_header_column(header_row, column)
+
+        local_column = column - first_col
+        for row in rows:
+            yield _normalize_cell(row[local_column] if 0 <= local_column < len(row) else None)
+
+class OpenpyxlReader(TableReader):
+    """Движок на openpyxl в режиме read_only / values_only"""
+
+    name = 'openpyxl'
+    module = 'openpyxl'
+    extensions = ('.xlsx', '.xlsm')
+
+    def iter_column(self, path: Path, sheet: Union[int, str, None] = None,
+                    column: Union[int, str] = 0) -> Iterator[Any]:
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            if isinstance(sheet, str):
+                worksheet = workbook[sheet]
+            else:
+                worksheet = workbook.worksheets[sheet or 0]
+
+            min_row = 1
+            if isinstance(column, str):
+                header_row = next(worksheet.iter_rows(max_row=1, values_only=True), ())
+                column = _find_header_column(header_row, column)
+                min_row = 2
+
+            # Читаем только выбранный столбец
+            for (value,) in worksheet.iter_rows(min_row=min_row, min_col=column + 1,
+                                                max_col=column + 1, values_only=True):
+                yield _normalize_cell(value)
+        finally:
+            workbook.close()
+
+class PandasReader(TableReader):
+    """Запасной движок: pandas.read_excel только по выбранному столбцу"""
+
+    name = 'pandas'
+    module = 'pandas'
+    extensions = ('.xlsx', '.xlsm', '.xls', '.xlsb', '.ods')
+
+    def iter_column(self, path: Path, sheet: Union[int, str, None] = None,
+                    column: Union[int, str] = 0) -> Iterator[Any]:
+        # pandas импортируется только при выборе этого движка
+        import pandas as pd
+
+        sheet_name = sheet if sheet is not None else 0
+        if isinstance(column, str):
+            wanted = column.strip().casefold()
+            df = pd.read_excel(path, sheet_name=sheet_name, header=0,
+                               usecols=lambda name: str(name).strip().casefold() == wanted)
+            if len(df.columns) == 0:
+                raise TableError(f"Столбец с заголовком '{column}' не найден в первой строке")
+        else:
+            # callable, а не [column]: столбец за пределами данных дает пустую
+            # таблицу, а не ошибку - как у остальных движков
+            df = pd.read_excel(path, sheet_name=sheet_name, header=None,
+                               usecols=lambda index: index == column)
+            if len(df.columns) == 0:
+                return
+
+        for value in df.iloc[:, 0]:
+            yield _normalize_cell(value)
+
+@dataclass
+class CsvFormat:
+    """Кодировка и разделитель CSV-файла"""
+    encoding: str
+    delimiter: str
+
+def detect_csv_format(sample: bytes) -> CsvFormat:
+    """
+    Определяет кодировку и разделитель CSV по начальному фрагменту файла
+
+    Кодировка: BOM -> UTF-16 без BOM (есть нулевые байты) -> валидный UTF-8 ->
+    запасные кодировки из CONFIG['csv']['fallback_encodings'].
+    Разделитель: самый стабильный по числу полей из CONFIG['csv']['delimiters'].
+
+    Args:
+        sample: Первые байты файла (не более CONFIG['csv']['sample_bytes'])
+
+    Returns:
+        CsvFormat
+    """
+    csv_config = CONFIG['csv']
+
+    if sample.startswith(codecs.BOM_UTF8):
+        encoding = 'utf-8-sig'
+    elif sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        encoding = 'utf-16'
+    elif b'\x00' in sample:
+        # NUL не бывает в тексте UTF-8/cp1251, а кириллица в UTF-16 (байты
+        # 0x04 / 0x1F) проходит проверку UTF-8 как управляющие символы, поэтому
+        # решает любой NUL. Порядок байтов - по четности позиций NUL
+        if sample[1::2].count(0) >= sample[0::2].count(0):
+            encoding = _first_decodable(sample, ['utf-16-le', 'utf-16-be'])
+        else:
+            encoding = _first_decodable(sample, ['utf-16-be', 'utf-16-le'])
+    else:
+        encoding = _first_decodable(sample, ['utf-8'] + csv_config['fallback_encodings'])
+
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(sample, final=False)
+    # Последняя строка фрагмента может быть неполной
+    if len(sample) >= csv_config['sample_bytes'] and '\n' in text:
+        text = text[:text.rindex('\n')]
+
+    return CsvFormat(encoding=encoding, delimiter=_detect_delimiter(text))
+
+def _first_decodable(sample: bytes, encodings: List[str]) -> str:
+    """Первая кодировка, в которой фрагмент декодируется без ошибок"""
+    for candidate in encodings:
+        try:
+            # final=False: фрагмент может обрываться посреди символа
+            codecs.getincrementaldecoder(candidate)().decode(sample, final=False)
+        except UnicodeDecodeError:
+            continue
+        return candidate
+    raise TableError("Не удалось определить кодировку CSV")
+
+def _detect_delimiter(text: str) -> str:
+    """
+    Выбирает разделитель, дающий самое стабильное число полей (больше одного)
+
+    csv.Sniffer на коротких фрагментах часто ошибается из-за запятых
+    внутри имен, поэтому сравниваем число полей по строкам.
+    """
+    lines = text.splitlines()[:200]
+    best_delimiter = ','  # один столбец - разделитель не важен
+    best_score = (0.0, 0)
+
+    for delimiter in CONFIG['csv']['delimiters']:
+        counts = [len(row) for row in csv.reader(lines, delimiter=delimiter) if row]
+        if not counts:
+            continue
+        fields, frequency = Counter(counts).most_common(1)[0]
+        if fields < 2:
+            continue
+        score = (frequency / len(counts), fields)
+        if score > best_score:
+            best_delimiter, best_score = delimiter, score
+
+    return best_delimiter
+
+class CsvReader(TableReader):
+    """Потоковое чтение CSV модулем csv: только строки, без вывода типов"""
+
+    name = 'csv'
+    module = 'csv'
+    extensions = ('.csv',)
+
+    def __init__(self):
+        self.csv_format: Optional[CsvFormat] = None
+
+    def detect(self, path: Path) -> CsvFormat:
+        """Определяет формат по ограниченному фрагменту начала файла"""
+        with open(path, 'rb') as f:
+            self.csv_format = detect_csv_format(f.read(CONFIG['csv']['sample_bytes']))
+        return self.csv_format
+
+    def iter_column(self, path: Path, sheet: Union[int, str, None] = None,
+                    column: Union[int, str] = 0) -> Iterator[Any]:
+        with open(path, 'rb') as raw:
+            if self.csv_format is None:
+                # Фрагмент читается из того же дескриптора, затем чтение с начала
+                self.csv_format = detect_csv_format(raw.read(CONFIG['csv']['sample_bytes']))
+                raw.seek(0)
+
+            logging.info(
+                f"CSV {path.name}: кодировка {self.csv_format.encoding}, "
+                f"разделитель {self.csv_format.delimiter!r}"
+            )
+
+            f = io.TextIOWrapper(raw, encoding=self.csv_format.encoding, newline='')
+            # Пустые строки файла пропускаются (как skip_blank_lines в pandas)
+            rows = (row for row in csv.reader(f, delimiter=self.csv_format.delimiter) if row)
+
+            if isinstance(column, str):
+                column = _find_header_column(next(rows, []), column)
+
+            for row in rows:
+                value = row[column] if column < len(row) else ''
+                yield value if value != '' else None
+
+TABLE_READERS: Dict[str, type] = {
+    reader.name: reader
+    for reader in (CalamineReader, OpenpyxlReader, PandasReader, CsvReader)
+}
+
+def get_available_readers(path: Path) -> List[TableReader]:
+    """
+    Возвращает установленные движки, способные прочитать файл
+
+    Порядок соответствует CONFIG['table_reader']['priority'] (от быстрых к медленным).
+    """
+    if CsvReader.supports(path):
+        return [CsvReader()]
+
+    readers = []
+    for name in CONFIG['table_reader']['priority']:
+        reader_cls = TABLE_READERS[name]
+        if reader_cls.supports(path) and reader_cls.is_available():
+            readers.append(reader_cls())
+    return readers
+
+def get_table_reader(path: Path, engine: str = 'auto') -> TableReader:
+    """
+    Выбирает движок чтения таблицы
+
+    Args:
+        path: Путь к таблице
+        engine: Имя движка или 'auto' для самого быстрого из доступных
+
+    Returns:
+        Экземпляр движка
+    """
+    if engine != 'auto' and not CsvReader.supports(path):
+        reader_cls = TABLE_READERS.get(engine)
+        if reader_cls is None:
+            raise TableError(f"Неизвестный движок чтения: {engine}")
+        if not reader_cls.supports(path):
+            raise TableError(f"Движок {engine} не поддерживает формат {path.suffix}")
+        if not reader_cls.is_available():
+            raise TableError(f"Движок {engine} не установлен (pip install {reader_cls.module})")
+        return reader_cls()
+
+    readers = get_available_readers(path)
+    if not readers:
+        raise TableError(
+            f"Нет установленного движка для формата {path.suffix} "
+            f"(установите python-calamine или openpyxl)"
+        )
+    return readers[0]
+
+# ============================================================================
+# КЭШ ТАБЛИЦ
+# ============================================================================
+
+class TableCache:
+    """
+    Дисковый кэш разобранных таблиц
+
+    Ключ - путь, размер, mtime_ns файла и параметры чтения. Запись хранит
+    статистику в JSON-заголовке и сжатый zlib список имен через '\\0'.
+    Старые записи вытесняются (LRU) при превышении общего размера.
+    """
+
+    MAGIC = b'FRT3'
+    SUFFIX = '.frt'
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        cache_config = CONFIG['table_cache']
+        self.cache_dir = Path(cache_dir or cache_config['dir'])
+        self.max_bytes = max_bytes if max_bytes is not None else cache_config['max_bytes']
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, table_path: Path, options: Dict[str, Any]) -> Optional[Path]:
+        """Возвращает путь записи кэша для текущего состояния файла таблицы"""
+        try:
+            resolved = table_path.resolve()
+            stat = resolved.stat()
+        except OSError:
+            return None
+
+        key_source = json.dumps(
+            [str(resolved), stat.st_size, stat.st_mtime_ns, options],
+            sort_keys=True, ensure_ascii=False
+        )
+        key = hashlib.sha1(key_source.encode('utf-8')).hexdigest()
+        return self.cache_dir / (key + self.SUFFIX)
+
+    def load(self, table_path: Path, options: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], List[Any]]]:
+        """
+        Возвращает (анализ, превью) из кэша или None при промахе
+
+        Args:
+            table_path: Путь к таблице
+            options: Параметры чтения, влияющие на результат
+        """
+        entry = self._entry_path(table_path, options)
+        data = None
+        if entry is not None:
+            try:
+                data = entry.read_bytes()
+            except OSError:
+                data = None
+
+        result = self._decode(data) if data else None
+        if result is None:
+            self.misses += 1
+            logging.info(f"Кэш таблицы: промах ({table_path.name}), попаданий: {self.hits}, промахов: {self.misses}")
+            return None
+
+        try:
+            os.utime(entry)  # отметка для LRU
+        except OSError:
+            pass
+
+        self.hits += 1
+        logging.info(f"Кэш таблицы: попадание ({table_path.name}), попаданий: {self.hits}, промахов: {self.misses}")
+        return result
+
+    def store(self, table_path: Path, options: Dict[str, Any],
+              analysis: Dict[str, Any], preview: List[Any]) -> None:
+        """Сохраняет результат разбора таблицы в кэш"""
+        entry = self._entry_path(table_path, options)
+        if entry is None:
+            return
+
+        names = analysis['valid_names']
+        names_blob = '\0'.join(names)
+        if names and names_blob.count('\0') != len(names) - 1:
+            logging.debug("Кэш таблицы: имена содержат символ \\0, запись пропущена")
+            return
+
+        meta = {key: value for key, value in analysis.items() if key != 'valid_names'}
+        meta['preview'] = [None if value is None else str(value) for value in preview]
+        meta_bytes = json.dumps(meta, ensure_ascii=False).encode('utf-8')
+
+        payload = b''.join([
+            self.MAGIC,
+            struct.pack('<I', len(meta_bytes)),
+            meta_bytes,
+            zlib.compress(names_blob.encode('utf-8'), 1)
+        ])
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = entry.with_suffix('.tmp')
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, entry)
+            self._evict()
+        except OSError as e:
+            logging.warning(f"Не удалось записать кэш таблицы: {str(e)}")
+
+    def _decode(self, data: bytes) -> Optional[Tuple[Dict[str, Any], List[Any]]]:
+        """Разбирает запись кэша, None если запись повреждена"""
+        try:
+            if data[:4] != self.MAGIC:
+                return None
+            (meta_len,) = struct.unpack_from('<I', data, 4)
+            meta = json.loads(data[8:8 + meta_len].decode('utf-8'))
+            names_blob = zlib.decompress(data[8 + meta_len:]).decode('utf-8')
+        except (struct.error, ValueError, zlib.error):
+            return None
+
+        preview = meta.pop('preview')
+        meta['valid_names'] = names_blob.split('\0') if names_blob else []
+        if len(meta['valid_names']) != meta.get('valid_count'):
+            return None
+        return meta, preview
+
+    def _evict(self) -> None:
+        """Удаляет самые старые записи, пока кэш превышает лимит"""
+        entries = []
+        total = 0
+        for entry in self.cache_dir.glob('*' + self.SUFFIX):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+                total -= size
+                logging.debug(f"Кэш таблицы: вытеснена запись {entry.name}")
+            except OSError:
+                pass
+
 # ============================================================================
 # ПРОЦЕССОР ТАБЛИЦ
 # ============================================================================
 
+class TableAnalyzer:
+    """
+    Однопроходный анализатор столбца имен
+
+    За один обход считает всего / пустых / пробельных / действительных строк,
+    дубликаты и уникальные имена и собирает список очищенных имен.
+    Строки, которые не удалось очистить, попадают в rejected (номер, причина).
+    Значения можно подавать порциями через feed().
+    """
+
+    def __init__(self, max_preview: Optional[int] = None, keep_names: bool = True):
+        self.keep_names = keep_names
+        self.valid_count = 0
+        self.max_preview = (
+            max_preview if max_preview is not None
+            else CONFIG['display']['max_preview_items']
+        )
+        self.total_rows = 0
+        self.empty_nan = 0
+        self.whitespace_only = 0
+        self.valid_names: List[str] = []
+        self.name_counts: Counter = Counter()
+        self.rejected: List[Tuple[int, str]] = []
+        self.preview: List[Any] = []
+
+    def feed(self, values: Iterable[Any]) -> List[str]:
+        """Обрабатывает очередную порцию значений столбца, возвращает ее очищенные имена"""
+        # Локальные ссылки заметно ускоряют горячий цикл
+        total_rows = self.total_rows
+        empty_nan = self.empty_nan
+        whitespace_only = self.whitespace_only
+        max_preview = self.max_preview
+        preview_append = self.preview.append
+        chunk_names: List[str] = []
+        chunk_append = chunk_names.append
+        chunk_rows = array('q')
+        rows_append = chunk_rows.append
+
+        for value in values:
+            if total_rows < max_preview:
+                preview_append(value)
+            total_rows += 1
+
+            if value is None:
+                empty_nan += 1
+                continue
+
+            name = value.strip() if value.__class__ is str else str(value).strip()
+            if not name:
+                whitespace_only += 1
+                continue
+
+            chunk_append(name)
+            rows_append(total_rows)
+
+        self.total_rows = total_rows
+        self.empty_nan = empty_nan
+        self.whitespace_only = whitespace_only
+
+        sanitized, rejected = sanitize_many(chunk_names)
+        for index, reason in rejected:
+            self.rejected.append((chunk_rows[index], reason))
+            logging.warning(f"Имя отклонено (строка {chunk_rows[index]}): {reason}")
+
+        self.valid_count += len(sanitized)
+        if self.keep_names:
+            self.valid_names.extend(sanitized)
+        self.name_counts.update(sanitized)
+        return sanitized
+
+    def result(self) -> Dict[str, Any]:
+        """Возвращает итог анализа в формате TableProcessor.analyze_content()"""
+        return {
+            'total_rows': self.total_rows,
+            'empty_nan': self.empty_nan,
+            'whitespace_only': self.whitespace_only,
+            'valid_names': self.valid_names,
+            'valid_count': self.valid_count,
+            'duplicates_original': {
+                name: count for name, count in self.name_counts.items() if count > 1
+            },
+            'unique_names': len(self.name_counts),
+            'rejected': self.rejected
+        }
+
 class TableProcessor:
     """Класс для обработки таблиц с именами файлов"""
 
-    def __init__(self, table_path: str):
+    def __init__(self, table_path: str, engine: Optional[str] = None,
+                 cache: Optional[TableCache] = None,
+                 sheet: Union[int, str, None] = None,
+                 column: Union[int, str, None] = None,
+                 has_header: Optional[bool] = None):
         self.table_path = Path(table_path)
-        self.df = None
-        self.names = None
+        self.engine = engine or CONFIG['table_reader']['engine']
+        self.cache = cache
+        self.sheet = sheet
+        self.column = parse_column_spec(column)
+        # None - определить автоматически; после загрузки has_header - результат
+        self.header_mode = has_header
+        self.has_header = False
+        self.header: Optional[str] = None
+        self.reader_name: Optional[str] = None
+        self.csv_format: Optional[CsvFormat] = None
+        # Результат однопроходного чтения: статистика и первые строки
+        self._analysis: Optional[Dict[str, Any]] = None
+        self._preview: List[Any] = []
         self._load_table()
 
     def _load_table(self) -> None:
@@ -200,249 +1142,2308 @@ class TableProcessor:
             raise FileNotFoundError(f"Файл таблицы не найден: {self.table_path}")
 
         try:
-            if self.table_path.suffix.lower() == '.csv':
-                self.df = pd.read_csv(self.table_path, encoding='utf-8', header=None)
+            reader = get_table_reader(self.table_path, self.engine)
+            self.reader_name = reader.name
+            if isinstance(reader, CsvReader):
+                # Формат нужен до чтения: он входит в ключ кэша
+                self.csv_format = reader.detect(self.table_path)
+
+            cached = self.cache.load(self.table_path, self._cache_options()) if self.cache else None
+            if cached is not None:
+                self._analysis, self._preview = cached
             else:
-                self.df = pd.read_excel(self.table_path, header=None)
+                values = reader.iter_column(self.table_path, self.sheet, self.column)
+                if isinstance(self.column, str):
+                    # Заголовок уже использован для выбора столбца
+                    has_header, header = True, self.column
+                else:
+                    has_header, header, values = split_header(values, self.header_mode)
+
+                # Статистика считается за тот же проход, что и чтение
+                self._scan_column(values)
+                self._analysis['has_header'] = has_header
+                self._analysis['header'] = None if header is None else str(header)
+                if self.cache:
+                    self.cache.store(self.table_path, self._cache_options(),
+                                     self._analysis, self._preview)
 
-            if len(self.df.columns) == 0:
+            total_rows = self._analysis['total_rows']
+            self.has_header = self._analysis['has_header']
+            self.header = self._analysis['header']
+
+            if total_rows == 0:
                 raise EmptyTableError("Таблица пуста")
 
-            self.names = self.df.iloc[:, 0]
-            logging.info(f"Загружена таблица: {self.table_path.name}, строк: {len(self.names)}")
+            logging.info(
+                f"Загружена таблица: {self.table_path.name}, строк: {total_rows}, "
+                f"движок: {self.reader_name}, лист: {self.sheet if self.sheet is not None else 1}, "
+                f"столбец: {self.column}, заголовок: {self.header if self.has_header else 'нет'}"
+            )
 
-        except pd.errors.EmptyDataError:
-            raise EmptyTableError("Файл таблицы пуст")
+        except TableError:
+            raise
         except Exception as e:
             raise TableError(f"Ошибка загрузки таблицы: {str(e)}")
 
-    def get_valid_names(self) -> pd.Series:
-        """Возвращает только действительные имена"""
-        non_empty = self.names.dropna()
-        non_empty_str = non_empty.astype(str).str.strip()
-        valid = non_empty_str[non_empty_str != '']
-
-        try:
-            valid = valid.apply(sanitize_filename)
-        except Exception as e:
-            logging.warning(f"Ошибка санитизации имен: {str(e)}")
+    def _cache_options(self) -> Dict[str, Any]:
+        """Параметры чтения, от которых зависит результат (часть ключа кэша)"""
+        return {
+            'reader': self.reader_name,
+            'sheet': self.sheet,
+            'column': self.column,
+            'header': self.header_mode,
+            'csv': [self.csv_format.encoding, self.csv_format.delimiter] if self.csv_format else None,
+            'invalid_chars': CONFIG['invalid_chars']
+        }
 
-        return valid
+    def _scan_column(self, values: Iterable[Any]) -> None:
+        """
+        Один проход по столбцу: подсчет статистики и сбор действительных имен
+
+        Столбец подается анализатору порциями по CONFIG['pipeline']['chunk_size'],
+        как в iter_table_names: промежуточные списки feed() (сырые имена и
+        номера строк) не растут до размера всей таблицы.
+        """
+        chunk_size = CONFIG['pipeline']['chunk_size']
+        analyzer = TableAnalyzer()
+        values = iter(values)
+        while True:
+            rows = list(islice(values, chunk_size))
+            if not rows:
+                break
+            analyzer.feed(rows)
+        self._analysis = analyzer.result()
+        self._preview = analyzer.preview
+
+    def get_valid_names(self) -> List[str]:
+        """Возвращает только действительные имена"""
+        return self._analysis['valid_names']
 
     def analyze_content(self) -> Dict[str, Any]:
         """Анализирует содержимое таблицы"""
-        total_rows = len(self.names)
-        empty_nan = self.names.isna().sum()
-
-        non_empty = self.names.dropna()
-        non_empty_str = non_empty.astype(str).str.strip()
-        whitespace_only = (non_empty_str == '').sum()
-
-        valid_names = self.get_valid_names()
-
-        duplicates_info = {}
-        if len(valid_names) > 0:
-            name_counts = Counter(valid_names.tolist())
-            duplicates_info = {name: count for name, count in name_counts.items() if count > 1}
-
-        return {
-            'total_rows': total_rows,
-            'empty_nan': int(empty_nan),
-            'whitespace_only': int(whitespace_only),
-            'valid_names': valid_names,
-            'valid_count': len(valid_names),
-            'duplicates_original': duplicates_info,
-            'unique_names': len(set(valid_names))
-        }
+        return self._analysis
 
     def get_preview(self, max_items: int = 5) -> List[tuple]:
         """Возвращает предварительный просмотр таблицы"""
         preview = []
-        for i, value in enumerate(self.names.head(max_items)):
-            if pd.isna(value):
+        for i, value in enumerate(self._preview[:max_items]):
+            if value is None:
                 preview.append((i + 1, "[ПУСТО]"))
             else:
                 preview.append((i + 1, str(value)))
         return preview
 
+def iter_table_names(table_path: str, engine: Optional[str] = None,
+                     chunk_size: Optional[int] = None,
+                     analyzer: Optional[TableAnalyzer] = None,
+                     sheet: Union[int, str, None] = None,
+                     column: Union[int, str, None] = None,
+                     has_header: Optional[bool] = None) -> Iterator[List[str]]:
+    """
+    Потоково читает таблицу и выдает порции действительных имен
+
+    Args:
+        table_path: Путь к таблице
+        engine: Движок чтения ('auto' по умолчанию)
+        chunk_size: Число строк таблицы в порции
+        analyzer: Анализатор для накопления статистики (keep_names=False)
+        sheet: Индекс или имя листа
+        column: Столбец (см. parse_column_spec)
+        has_header: Есть ли строка заголовка, None - определить автоматически
+
+    Yields:
+        Списки очищенных имен
+    """
+    path = Path(table_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Файл таблицы не найден: {path}")
+
+    chunk_size = chunk_size or CONFIG['pipeline']['chunk_size']
+    analyzer = analyzer if analyzer is not None else TableAnalyzer(keep_names=False)
+    reader = get_table_reader(path, engine or CONFIG['table_reader']['engine'])
+    logging.info(f"Потоковое чтение таблицы: {path.name}, движок: {reader.name}")
+
+    column = parse_column_spec(column)
+    values = reader.iter_column(path, sheet, column)
+    if not isinstance(column, str):
+        has_header, header, values = split_header(values, has_header)
+        if has_header:
+            logging.info(f"Строка заголовка пропущена: {header}")
+
+    while True:
+        rows = list(islice(values, chunk_size))
+        if not rows:
+            break
+        names = analyzer.feed(rows)
+        if names:
+            yield names
+
 # ============================================================================
 # ПЕРЕИМЕНОВАНИЕ ФАЙЛОВ
 # ============================================================================
 
-@dataclass
+# Статусы операций и их коды в OperationTable
+STATUS_NAMES = ('pending', 'success', 'error', 'skipped')
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+def _status_code(status: str) -> int:
+    """Код статуса операции"""
+    try:
+        return STATUS_CODES[status]
+    except KeyError:
+        raise ValueError(f"Неизвестный статус операции: {status}") from None
+
+class OperationTable:
+    """
+    Компактный план переименования: столбцы вместо объекта на операцию
+
+    Имена хранятся относительно folder_path (полный Path строится по
+    запросу), статус - код в array('b'), номер дубликата - в array('l')
+    (0 - не дубликат), тексты ошибок - в словаре только для строк с
+    ошибкой. Индексы по статусам и дубликатам ведутся при каждом
+    изменении, поэтому выборки стоят O(k), а подсчет - O(1).
+
+    Строки читаются через представления RenameOperation.
+    """
+
+    def __init__(self, folder_path: Path):
+        self.folder_path = Path(folder_path)
+        self.indexes = array('l')
+        self.old_names: List[str] = []
+        self.new_names: List[str] = []
+        self.statuses = array('b')
+        self.duplicate_numbers = array('l')
+        self.errors: Dict[int, str] = {}
+        self._by_status: List[set] = [set() for _ in STATUS_NAMES]
+        self._duplicates = array('l')
+
+    def append(self, index: int, old_name: str, new_name: str, status: str,
+               error_message: Optional[str] = None,
+               duplicate_number: Optional[int] = None) -> int:
+        """Добавляет операцию и возвращает номер ее строки"""
+        row = len(self.old_names)
+        code = _status_code(status)
+        self.indexes.append(index)
+        self.old_names.append(old_name)
+        self.new_names.append(new_name)
+        self.statuses.append(code)
+        self.duplicate_numbers.append(duplicate_number or 0)
+        self._by_status[code].add(row)
+        if duplicate_number:
+            self._duplicates.append(row)
+        if error_message is not None:
+            self.errors[row] = error_message
+        return row
+
+    def set_status(self, row: int, status: str) -> None:
+        """Меняет статус строки, обновляя индекс по статусам"""
+        code = _status_code(status)
+        previous = self.statuses[row]
+        if previous != code:
+            self._by_status[previous].discard(row)
+            self._by_status[code].add(row)
+            self.statuses[row] = code
+
+    def truncate(self, length: int) -> None:
+        """Отбрасывает строки начиная с length"""
+        for column in (self.indexes, self.old_names, self.new_names,
+                       self.statuses, self.duplicate_numbers):
+            del column[length:]
+        self.errors = {row: message for row, message in self.errors.items() if row < length}
+        self._rebuild_indexes()
+
+    def reset_statuses(self, codes: array, errors: Dict[int, str]) -> None:
+        """Заменяет статусы и тексты ошибок всех строк (например, после предпросмотра)"""
+        self.statuses = array('b', codes)
+        self.errors = dict(errors)
+        self._rebuild_indexes()
+
+    def _rebuild_indexes(self) -> None:
+        """Пересобирает индексы по статусам и дубликатам из столбцов"""
+        rows = range(len(self.statuses))
+        # Код 'pending' равен 0: ненулевые коды отбираются compress, остальное - pending
+        others = list(compress(rows, self.statuses))
+        self._by_status = [set() for _ in STATUS_NAMES]
+        for row in others:
+            self._by_status[self.statuses[row]].add(row)
+        self._by_status[STATUS_CODES['pending']] = set(rows).difference(others)
+        self._duplicates = array('l', compress(rows, self.duplicate_numbers))
+
+    def count(self, status: str) -> int:
+        """Число операций со статусом status (O(1))"""
+        return len(self._by_status[_status_code(status)])
+
+    def by_status(self, status: str) -> List['RenameOperation']:
+        """Операции со статусом status в порядке плана"""
+        return [RenameOperation(self, row) for row in sorted(self._by_status[_status_code(status)])]
+
+    def duplicates(self) -> List['RenameOperation']:
+        """Операции-дубликаты в порядке плана"""
+        return [RenameOperation(self, row) for row in self._duplicates]
+
+    def __len__(self) -> int:
+        return len(self.old_names)
+
+    def __iter__(self) -> Iterator['RenameOperation']:
+        return (RenameOperation(self, row) for row in range(len(self.old_names)))
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [RenameOperation(self, row) for row in range(len(self.old_names))[item]]
+        if item < 0:
+            item += len(self.old_names)
+        if not 0 <= item < len(self.old_names):
+            raise IndexError("Номер операции вне плана")
+        return RenameOperation(self, item)
+
 class RenameOperation:
-    """Класс для хранения информации об операции переименования"""
-    index: int
-    old_path: Path
-    new_name: str
-    status: str  # 'pending', 'success', 'error', 'skipped'
-    error_message: Optional[str] = None
-    is_duplicate: bool = False
-    duplicate_number: Optional[int] = None
+    """
+    Операция переименования - представление строки OperationTable
+
+    Чтение и запись атрибутов идут в столбцы таблицы; смена status
+    обновляет индексы таблицы. Представления одной строки равны.
+    """
+    __slots__ = ('table', 'row')
+
+    def __init__(self, table: OperationTable, row: int):
+        self.table = table
+        self.row = row
+
+    @property
+    def index(self) -> int:
+        return self.table.indexes[self.row]
+
+    @property
+    def old_name(self) -> str:
+        return self.table.old_names[self.row]
+
+    @property
+    def old_path(self) -> Path:
+        return self.table.folder_path / self.table.old_names[self.row]
+
+    @property
+    def new_name(self) -> str:
+        return self.table.new_names[self.row]
+
+    @property
+    def status(self) -> str:  # 'pending', 'success', 'error', 'skipped'
+        return STATUS_NAMES[self.table.statuses[self.row]]
+
+    @status.setter
+    def status(self, value: str) -> None:
+        self.table.set_status(self.row, value)
+
+    @property
+    def error_message(self) -> Optional[str]:
+        return self.table.errors.get(self.row)
+
+    @error_message.setter
+    def error_message(self, value: Optional[str]) -> None:
+        if value is None:
+            self.table.errors.pop(self.row, None)
+        else:
+            self.table.errors[self.row] = value
+
+    @property
+    def duplicate_number(self) -> Optional[int]:
+        return self.table.duplicate_numbers[self.row] or None
+
+    @property
+    def is_duplicate(self) -> bool:
+        return self.table.duplicate_numbers[self.row] > 0
+
+    def __eq__(self, other) -> bool:
+        return (
+            isinstance(other, RenameOperation)
+            and other.table is self.table and other.row == self.row
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.table), self.row))
+
+    def __repr__(self) -> str:
+        return (
+            f"RenameOperation(index={self.index}, old_name={self.old_name!r}, "
+            f"new_name={self.new_name!r}, status={self.status!r})"
+        )
+
+@dataclass
+class RenameStep:
+    """Шаг выполнения: переименование source -> target внутри папки"""
+    operation: RenameOperation
+    source: str
+    target: str
+    is_final: bool = True  # False - перенос во временное имя для разрыва цикла
+    journal_seq: int = -1  # номер намерения в журнале выполнения
+
+def block_unresolvable(operations: List[RenameOperation],
+                       key: Optional[Callable[[str], str]] = None) -> int:
+    """
+    Помечает ошибкой операции, чье целевое имя не освободится
+
+    Целевое имя может совпадать с текущим именем другого файла пакета,
+    если тот файл сам будет переименован. Если его операция не выполняется
+    (ошибка/пропуск), ждущая операция тоже невыполнима - и так по цепочке.
+
+    Args:
+        operations: План переименования
+        key: Ключ сравнения имен (см. get_collision_key)
+
+    Returns:
+        Число заблокированных операций
+    """
+    if isinstance(operations, OperationTable):
+        return _block_unresolvable_rows(operations, key)
+
+    key = key or _exact_key
+    by_source = {key(op.old_name): op for op in operations}
+    waiting = {}
+    for op in operations:
+        target = key(op.new_name)
+        if op.status == 'pending' and target != key(op.old_name) and target in by_source:
+            waiting[target] = op
+
+    stack = [op for target, op in waiting.items() if by_source[target].status != 'pending']
+    blocked = 0
+    while stack:
+        operation = stack.pop()
+        if operation.status != 'pending':
+            continue
+        operation.status = 'error'
+        operation.error_message = 'Файл с таким именем уже существует'
+        blocked += 1
+        dependent = waiting.get(key(operation.old_name))
+        if dependent is not None:
+            stack.append(dependent)
+
+    return blocked
+
+def _block_unresolvable_rows(table: OperationTable,
+                             key: Optional[Callable[[str], str]] = None) -> int:
+    """block_unresolvable по столбцам таблицы, без представлений строк"""
+    if key is None:
+        sources = table.old_names
+        targets = table.new_names
+    else:
+        sources = list(map(key, table.old_names))
+        targets = list(map(key, table.new_names))
+
+    # Обычно целевые имена с именами файлов пакета почти не пересекаются:
+    # пересечение считается на уровне C, строки отбираются через compress
+    hits = set(sources).intersection(targets)
+    if not hits:
+        return 0
+    rows = range(len(sources))
+    by_source = {sources[row]: row for row in compress(rows, map(hits.__contains__, sources))}
+
+    statuses = table.statuses
+    pending_code = STATUS_CODES['pending']
+    waiting = {}
+    for row in compress(rows, map(hits.__contains__, targets)):
+        target = targets[row]
+        if statuses[row] == pending_code and target != sources[row]:
+            waiting[target] = row
+
+    stack = [row for target, row in waiting.items() if statuses[by_source[target]] != pending_code]
+    blocked = 0
+    while stack:
+        row = stack.pop()
+        if statuses[row] != pending_code:
+            continue
+        table.set_status(row, 'error')
+        table.errors[row] = 'Файл с таким именем уже существует'
+        blocked += 1
+        dependent = waiting.get(sources[row])
+        if dependent is not None:
+            stack.append(dependent)
+
+    return blocked
+
+def _temp_name(source: str, taken: set, key: Callable[[str], str]) -> str:
+    """Свободное временное имя для разрыва цикла переименований"""
+    candidate = f"{source}.renamer-tmp"
+    counter = 1
+    while key(candidate) in taken:
+        candidate = f"{source}.renamer-tmp{counter}"
+        counter += 1
+    taken.add(key(candidate))
+    return candidate
+
+def order_rename_chains(operations: List[RenameOperation],
+                        existing_names: Iterable[str] = (),
+                        key: Optional[Callable[[str], str]] = None) -> List[List[RenameStep]]:
+    """
+    Упорядочивает ожидающие операции с учетом зависимостей между ними
+
+    Операция a->b зависит от b->c: имя b освободится только после нее.
+    У каждого имени не более одного претендента, поэтому зависимости
+    образуют непересекающиеся цепочки и циклы. Цепочка выполняется от
+    свободного конца; цикл разрывается одним временным именем (меньше
+    нельзя), например обмен a<->b: a->tmp, b->a, tmp->b.
+
+    Args:
+        operations: План (учитываются только операции 'pending')
+        existing_names: Ключи имен в папке (временные имена их не займут)
+        key: Ключ сравнения имен (см. get_collision_key)
+
+    Returns:
+        Список цепочек; шаги внутри цепочки выполняются строго по порядку
+    """
+    key = key or _exact_key
+    pending = [op for op in operations if op.status == 'pending']
+    source_keys = {id(op): key(op.old_name) for op in pending}
+    target_keys = {id(op): key(op.new_name) for op in pending}
+    by_source = {source_keys[id(op)]: op for op in pending}
+    # Кто ждет освобождения имени: ключ целевого имени -> операция.
+    # Смена только регистра (ключи равны) - не зависимость
+    waiter = {
+        target_keys[id(op)]: op for op in pending
+        if target_keys[id(op)] != source_keys[id(op)] and target_keys[id(op)] in by_source
+    }
+
+    taken = set(existing_names)
+    taken.update(target_keys.values())
+
+    chains: List[List[RenameStep]] = []
+    visited = set()
+
+    # Цепочки: начинаем с операций, чье целевое имя уже свободно
+    for operation in pending:
+        if id(operation) in visited or target_keys[id(operation)] in waiter:
+            continue
+        chain = []
+        current = operation
+        while current is not None and id(current) not in visited:
+            visited.add(id(current))
+            chain.append(RenameStep(current, current.old_name, current.new_name))
+            current = waiter.get(source_keys[id(current)])
+        chains.append(chain)
+
+    # Оставшиеся операции образуют циклы
+    for operation in pending:
+        if id(operation) in visited:
+            continue
+        visited.add(id(operation))
+        temp = _temp_name(operation.old_name, taken, key)
+        chain = [RenameStep(operation, operation.old_name, temp, is_final=False)]
+        current = waiter.get(source_keys[id(operation)])
+        while current is not operation:
+            visited.add(id(current))
+            chain.append(RenameStep(current, current.old_name, current.new_name))
+            current = waiter.get(source_keys[id(current)])
+        chain.append(RenameStep(operation, temp, operation.new_name))
+        chains.append(chain)
+
+    return chains
+
+class OperationPlanner:
+    """
+    Пошаговое построение операций с нумерацией дубликатов
+
+    Хранит счетчики базовых имен и занятые итоговые имена, поэтому
+    строки можно подавать по одной (в том числе потоково).
+    Коллизии проверяются по снимку имен папки, без обращений к диску.
+    Имена файлов из movable_names не считаются коллизией: эти файлы сами
+    будут переименованы (порядок выполнения задает order_rename_chains).
+
+    Все множества хранят ключи имен (collision_key), а не сами имена: на
+    NTFS/SMB "Video" и "video" - один файл. existing_names - уже ключи.
+    """
+
+    def __init__(self, folder_path: Path, existing_names: Iterable[str] = (),
+                 movable_names: Iterable[str] = (),
+                 collision_key: Optional[Callable[[str], str]] = None,
+                 table: Optional[OperationTable] = None,
+                 keep_rows: bool = False):
+        self.folder_path = folder_path
+        # Таблица, в которую дописываются операции
+        self.table = table if table is not None else OperationTable(folder_path)
+        self.suffix = CONFIG['file_suffix']  # _TZ
+        self.collision_key = collision_key
+        self._key = collision_key or _exact_key
+        self.base_name_counter: Dict[str, int] = defaultdict(int)
+        self.used_final_names = set()
+        # Ключи имен в папке с учетом уже запланированных (копия снимка)
+        self.existing_names = set(existing_names)
+        self.movable_names = set(map(self._key, movable_names))
+        # Построчные данные для инкрементального перепланирования (keep_rows)
+        self.keep_rows = keep_rows
+        self.row_bases: List[str] = []
+        self.row_stems: List[str] = []
+        self.probes = 0
+
+    def plan(self, index: int, file_path: Path, original_name: str) -> RenameOperation:
+        """Строит операцию для очередного файла и имени из таблицы"""
+        base_name = extract_base_name(original_name)
+        base_key = self._key(base_name)
+        self.base_name_counter[base_key] += 1
+        if self.keep_rows:
+            self.row_bases.append(base_name)
+        row = self._plan_numbered(index, file_path, base_name, self.base_name_counter[base_key])
+        return RenameOperation(self.table, row)
+
+    def plan_many(self, start_index: int, files: List[Path],
+                  names: List[str]) -> OperationTable:
+        """
+        Пакетно строит операции для пар (файл, имя)
+
+        Базовые имена и номера дубликатов считаются одним проходом
+        (plan_duplicate_numbers), результат совпадает с plan() по строкам.
+
+        Returns:
+            Таблица планировщика с дописанными операциями
+        """
+        bases, occurrences = plan_duplicate_numbers(
+            names, self.base_name_counter, self.collision_key
+        )
+        if self.keep_rows:
+            self.row_bases.extend(bases)
+        plan_numbered = self._plan_numbered
+        for offset, (file_path, base_name, occurrence) in enumerate(zip(files, bases, occurrences)):
+            plan_numbered(start_index + offset, file_path, base_name, occurrence)
+        return self.table
+
+    def _plan_numbered(self, index: int, file_path: Path,
+                       base_name: str, occurrence: int) -> int:
+        """Дописывает операцию по базовому имени и номеру вхождения, возвращает строку"""
+        original_extension = file_path.suffix
+
+        duplicate_num = None
+
+        if occurrence == 1:
+            final_base_name = base_name
+        else:
+            final_base_name = f"{base_name} ({occurrence - 1})"
+            duplicate_num = occurrence - 1
+
+        key = self._key
+        used_final_names = self.used_final_names
+        temp_final_name = final_base_name
+        temp_key = key(temp_final_name)
+        if temp_key in used_final_names:
+            # Номер вхождения у базового имени не повторяется, поэтому
+            # каждое "{base} ({k}_j)" перебирается не более одного раза
+            suffix_counter = 1
+            while temp_key in used_final_names:
+                temp_final_name = f"{base_name} ({occurrence - 1}_{suffix_counter})"
+                temp_key = key(temp_final_name)
+                suffix_counter += 1
+            self.probes += 1
+
+        final_name_without_ext = temp_final_name
+
+        # ДОБАВЛЯЕМ СУФФИКС _TZ ПЕРЕД РАСШИРЕНИЕМ
+        final_name_with_ext = final_name_without_ext + self.suffix + original_extension
+        final_key = key(final_name_with_ext)
+
+        used_final_names.add(temp_key)
+        if self.keep_rows:
+            self.row_stems.append(temp_key)
+
+        collision = (
+            final_key in self.existing_names
+            and final_key != key(file_path.name)
+            and final_key not in self.movable_names
+        )
+        self.existing_names.add(final_key)
+
+        if collision:
+            return self.table.append(
+                index, file_path.name, final_name_with_ext, 'error',
+                'Файл с таким именем уже существует', duplicate_num
+            )
+
+        return self.table.append(
+            index, file_path.name, final_name_with_ext, 'pending',
+            duplicate_number=duplicate_num
+        )
+
+@dataclass
+class PlanState:
+    """
+    Данные последнего плана для инкрементального перепланирования
+
+    Номер дубликата зависит от всех строк выше, поэтому для строки i
+    достаточно знать базовые имена и занятые итоговые имена строк до i:
+    состояние планировщика восстанавливается из префикса без пересчета.
+    """
+    names: List[str]            # имена таблицы, вошедшие в план
+    file_names: List[str]       # имена файлов папки в порядке плана
+    snapshot: set               # ключи имен папки на момент планирования
+    movable: set                # ключи имен файлов пакета
+    bases: List[str]            # базовое имя каждой строки
+    base_keys: List[str]        # ключи базовых имен
+    stems: List[str]            # ключи итоговых имен без расширения
+    codes: array                # статусы после планирования (до блокировок)
+    errors: Dict[int, str]      # тексты ошибок и пропусков после планирования
+    probes: int                 # сколько строк подбирали "{base} ({k}_{j})"
+    key: Optional[Callable[[str], str]]
+
+def _first_difference(old: List[str], new: List[str], block: int = 4096) -> int:
+    """Индекс первого расхождения двух списков (или длина общего префикса)"""
+    length = min(len(old), len(new))
+    # Блоки сравниваются срезами (на уровне C), поэлементно - только блок с отличием
+    start = 0
+    while start < length and old[start:start + block] == new[start:start + block]:
+        start += block
+    for position in range(start, min(start + block, length)):
+        if old[position] != new[position]:
+            return position
+    return length
+
+# Порядок файлов: ключ сортировки считается один раз на элемент папки
+# из данных os.DirEntry (имя; для mtime/size - entry.stat(), который на
+# Windows берется из результата scandir без отдельного обращения к диску)
+
+_NATURAL_RE = re.compile(r'(\d+)')
+_YO_TABLE = str.maketrans({'ё': 'е'})
+
+def natural_key(name: str) -> Tuple[tuple, str]:
+    """Естественный порядок: "file2" раньше "file10", без учета регистра"""
+    parts = _NATURAL_RE.split(name.casefold())
+    parts[1::2] = map(int, parts[1::2])
+    return tuple(parts), name
+
+def cyrillic_key(name: str) -> Tuple[tuple, str, str]:
+    """
+    Алфавитный порядок для кириллицы: "ё" сразу после "е", а не после "я"
+
+    Латиница идет раньше кириллицы (A-Z, А-Я), числа сравниваются как
+    в natural_key; при равенстве первичных ключей "е" раньше "ё".
+    """
+    folded = unicodedata.normalize('NFC', name).casefold()
+    parts = _NATURAL_RE.split(folded.translate(_YO_TABLE))
+    parts[1::2] = map(int, parts[1::2])
+    return tuple(parts), folded, name
+
+def _order_by_name(entry: os.DirEntry) -> str:
+    return entry.name.lower()
+
+def _order_natural(entry: os.DirEntry) -> Tuple[tuple, str]:
+    return natural_key(entry.name)
+
+def _order_locale(entry: os.DirEntry) -> Tuple[tuple, str, str]:
+    return cyrillic_key(entry.name)
+
+def _order_by_mtime(entry: os.DirEntry) -> Tuple[int, str]:
+    return entry.stat().st_mtime_ns, entry.name.lower()
+
+def _order_by_size(entry: os.DirEntry) -> Tuple[int, str]:
+    return entry.stat().st_size, entry.name.lower()
+
+FILE_ORDERS: Dict[str, Callable[[os.DirEntry], Any]] = {
+    'name': _order_by_name,
+    'natural': _order_natural,
+    'locale': _order_locale,
+    'mtime': _order_by_mtime,
+    'size': _order_by_size
+}
+
+@dataclass
+class FolderScan:
+    """Результат одного прохода scandir по папке"""
+    path: Path
+    files: List[Path]           # файлы в порядке сортировки
+    file_names: List[str]       # их имена
+    existing_names: set         # ключи имен всех элементов папки
+    subdirs: List[str]          # пути вложенных папок (без перехода по ссылкам)
+    stamps: Dict[str, Tuple[int, int]] = field(default_factory=dict)  # имя -> (size, mtime_ns)
+
+def scan_folder(folder_path: Path, order: str = 'name',
+                collision_key: Optional[Callable[[str], str]] = None,
+                stamps: bool = False) -> FolderScan:
+    """
+    Читает папку одним проходом scandir
+
+    Args:
+        folder_path: Папка
+        order: Порядок файлов (ключ FILE_ORDERS)
+        collision_key: Ключ имен для снимка (см. get_collision_key)
+        stamps: Собрать (size, mtime_ns) файлов (на Windows - без
+            дополнительных обращений к диску, из данных scandir)
+    """
+    if order not in FILE_ORDERS:
+        raise ValueError(f"Неизвестный порядок файлов: {order}")
+    order_key = FILE_ORDERS[order]
+    key = collision_key or _exact_key
+
+    found = []
+    existing_names = set()
+    subdirs = []
+    file_stamps = {}
+    with os.scandir(folder_path) as entries:
+        for entry in entries:
+            existing_names.add(key(entry.name))
+            if entry.is_file():
+                found.append((order_key(entry), entry.name, entry.path))
+                if stamps:
+                    st = entry.stat()
+                    file_stamps[entry.name] = (st.st_size, st.st_mtime_ns)
+            elif entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+    found.sort(key=lambda item: item[0])
+
+    return FolderScan(
+        path=Path(folder_path),
+        files=[Path(path) for _, _, path in found],
+        file_names=[name for _, name, _ in found],
+        existing_names=existing_names,
+        subdirs=subdirs,
+        stamps=file_stamps
+    )
+
+def walk_folders(root: Path, order: str = 'name',
+                 collision_key: Optional[Callable[[str], str]] = None,
+                 workers: Optional[int] = None, stamps: bool = False) -> List[FolderScan]:
+    """
+    Параллельный обход дерева папок пулом потоков
+
+    Каждая папка читается отдельной задачей scan_folder; вложенные папки
+    ставятся в очередь сразу по мере обнаружения. На сетевых дисках время
+    уходит в основном на ожидание ответа, поэтому потоки дают ускорение
+    несмотря на GIL. Недоступные вложенные папки пропускаются с
+    предупреждением в логе.
+
+    Returns:
+        Результаты по всем папкам (в порядке завершения)
+    """
+    workers = workers or CONFIG['recursive']['workers']
+    root = Path(root)
+    scans = []
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {pool.submit(scan_folder, root, order, collision_key, stamps): root}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder = running.pop(future)
+                try:
+                    scan = future.result()
+                except OSError as e:
+                    if folder == root:
+                        raise
+                    logging.warning(f"Папка пропущена: {folder} - {str(e)}")
+                    continue
+                scans.append(scan)
+                for subdir in scan.subdirs:
+                    running[pool.submit(scan_folder, subdir, order, collision_key, stamps)] = subdir
+
+    return scans
+
+# Формат сохраненного плана: строка-заголовок JSON, затем по строке
+# на операцию - массив значений в порядке PLAN_FIELDS
+PLAN_FORMAT = 'file-renamer-plan'
+PLAN_VERSION = 1
+PLAN_FIELDS = [
+    'index', 'old_name', 'new_name', 'status', 'error', 'duplicate',
+    'dev', 'inode', 'size', 'mtime_ns'
+]
+
+
+def _parse_plan_header(line: str, plan_name: str) -> Dict[str, Any]:
+    """Разбирает строку-заголовок плана и проверяет формат и версию"""
+    try:
+        header = json.loads(line)
+    except ValueError:
+        raise PlanError(f"Файл не является планом переименования: {plan_name}")
+    if not isinstance(header, dict) or header.get('format') != PLAN_FORMAT:
+        raise PlanError(f"Файл не является планом переименования: {plan_name}")
+    if header.get('version') != PLAN_VERSION:
+        raise PlanError(f"Неподдерживаемая версия плана: {header.get('version')}")
+    return header
+
+
+# Журнал выполнения (JSON Lines): заголовок, затем записи
+#   {"folder": id, "path": ...}                  - папка
+#   {"seq": n, "folder", "chain", "index", "source", "target", "final"}
+#                                                - намерение (шаг цепочки)
+#   {"done": n} / {"failed": n, "error": ...} / {"undone": n} - исход шага
+#   {"end": ..., "stats": {...}}                 - запуск завершен
+JOURNAL_FORMAT = 'file-renamer-journal'
+JOURNAL_VERSION = 1
+
+def _journal_line(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False) + '\n'
+
+class RenameJournal:
+    """
+    Журнал упреждающей записи для выполнения плана
+
+    Намерения шагов записываются и сбрасываются на диск (fsync) до начала
+    переименований - одним fsync на весь план или порцию. Исходы шагов
+    копятся в буфере и сбрасываются группой: каждые group_size записей или
+    не реже чем раз в group_ms миллисекунд. Потерянный при сбое хвост
+    исходов восстанавливается по состоянию папки (см. recover_journals).
+    Перенос во временное имя (начало цикла) фиксируется сразу: начальное и
+    конечное состояние цикла по одним именам файлов не различить.
+
+    Потокобезопасен: один журнал пишут все потоки выполнения.
+    """
+
+    def __init__(self, path: Optional[str] = None, group_size: Optional[int] = None,
+                 group_ms: Optional[float] = None):
+        config = CONFIG['journal']
+        if path is None:
+            directory = Path(config['directory'])
+            directory.mkdir(parents=True, exist_ok=True)
+            _prune_journals(directory, config['keep'])
+            path = directory / f"{datetime.now():%Y%m%d-%H%M%S-%f}.jsonl"
+        self.path = Path(path)
+        self.group_size = group_size or config['group_size']
+        self.group_seconds = (group_ms if group_ms is not None else config['group_ms']) / 1000
+
+        self._file = open(self.path, 'a', encoding='utf-8', newline='\n')
+        self._lock = threading.Lock()
+        self._buffer: List[str] = []
+        self._synced_at = time.monotonic()
+        self._folders: Dict[str, int] = {}
+        self._next_seq = 0
+        self._next_chain = 0
+        self.syncs = 0
+
+        self._write({
+            'format': JOURNAL_FORMAT,
+            'version': JOURNAL_VERSION,
+            'started': datetime.now().isoformat(timespec='seconds'),
+            'host': platform.node()
+        }, sync=True)
+
+    def intend(self, folder_path: Path, chains: List[List[RenameStep]]) -> None:
+        """Записывает намерения шагов и сбрасывает их на диск до выполнения"""
+        with self._lock:
+            folder = str(folder_path)
+            folder_id = self._folders.get(folder)
+            if folder_id is None:
+                folder_id = self._folders[folder] = len(self._folders)
+                self._buffer.append(_journal_line({'folder': folder_id, 'path': folder}))
+
+            for chain in chains:
+                chain_id = self._next_chain
+                self._next_chain += 1
+                for step in chain:
+                    step.journal_seq = self._next_seq
+                    self._next_seq += 1
+                    self._buffer.append(_journal_line({
+                        'seq': step.journal_seq,
+                        'folder': folder_id,
+                        'chain': chain_id,
+                        'index': step.operation.index,
+                        'source': step.source,
+                        'target': step.target,
+                        'final': step.is_final
+                    }))
+            self._sync()
+
+    def done(self, step: RenameStep, stamp: Optional[Tuple[int, int]] = None) -> None:
+        """Шаг выполнен; stamp - (size, mtime_ns) файла для проверки при отмене"""
+        record = {'done': step.journal_seq}
+        if stamp is not None:
+            record['size'], record['mtime_ns'] = stamp
+        self._write(record, sync=not step.is_final)
+
+    def failed(self, step: RenameStep, message: Optional[str]) -> None:
+        self._write({'failed': step.journal_seq, 'error': message})
+
+    def undone(self, step: RenameStep) -> None:
+        self._write({'undone': step.journal_seq})
+
+    def close(self, stats: Optional[Dict[str, int]] = None) -> None:
+        """
+        Закрывает журнал
+
+        Args:
+            stats: Итоги запуска; без них журнал остается незавершенным
+                (например, выполнение прервано исключением)
+        """
+        if self._file.closed:
+            return
+        if stats is not None:
+            self._write({
+                'end': datetime.now().isoformat(timespec='seconds'),
+                'stats': stats
+            }, sync=True)
+        with self._lock:
+            self._sync()
+            self._file.close()
+
+    def _write(self, record: Dict[str, Any], sync: bool = False) -> None:
+        with self._lock:
+            self._buffer.append(_journal_line(record))
+            if (sync or len(self._buffer) >= self.group_size
+                    or time.monotonic() - self._synced_at >= self.group_seconds):
+                self._sync()
+
+    def _sync(self) -> None:
+        """Групповая фиксация буфера (вызывается под self._lock)"""
+        if self._buffer:
+            self._file.write(''.join(self._buffer))
+            self._buffer.clear()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._synced_at = time.monotonic()
+        self.syncs += 1
+
+@dataclass
+class JournalContents:
+    """Прочитанный журнал выполнения"""
+    path: Path
+    header: Dict[str, Any]
+    folders: Dict[int, str]
+    steps: List[Dict[str, Any]]     # намерения в порядке seq
+    outcomes: Dict[int, str]        # seq -> 'done' | 'failed' | 'undone'
+    end: Optional[Dict[str, Any]]
+    stamps: Dict[int, Tuple[int, int]] = field(default_factory=dict)  # seq -> (size, mtime_ns)
+
+def read_journal(journal_path: str) -> JournalContents:
+    """
+    Читает журнал выполнения
+
+    Оборванная последняя строка (сбой во время записи) пропускается.
+
+    Raises:
+        JournalError: Файл не является журналом или поврежден
+    """
+    journal_path = Path(journal_path)
+    with open(journal_path, encoding='utf-8') as f:
+        lines = f.read().split('\n')
+
+    try:
+        header = json.loads(lines[0])
+    except ValueError:
+        raise JournalError(f"Файл не является журналом выполнения: {journal_path.name}")
+    if not isinstance(header, dict) or header.get('format') != JOURNAL_FORMAT:
+        raise JournalError(f"Файл не является журналом выполнения: {journal_path.name}")
+    if header.get('version') != JOURNAL_VERSION:
+        raise JournalError(f"Неподдерживаемая версия журнала: {header.get('version')}")
+
+    contents = JournalContents(journal_path, header, {}, [], {}, None)
+    last = len(lines) - 1
+    for line_number, line in enumerate(lines[1:], 1):
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            if line_number == last:
+                logging.warning(f"Журнал {journal_path.name}: оборванная запись пропущена")
+                break
+            raise JournalError(f"Журнал поврежден (строка {line_number + 1})")
+
+        if 'seq' in record:
+            contents.steps.append(record)
+        elif 'done' in record:
+            contents.outcomes[record['done']] = 'done'
+            if 'size' in record:
+                contents.stamps[record['done']] = (record['size'], record['mtime_ns'])
+        elif 'failed' in record:
+            contents.outcomes[record['failed']] = 'failed'
+        elif 'undone' in record:
+            contents.outcomes[record['undone']] = 'undone'
+        elif 'folder' in record:
+            contents.folders[record['folder']] = record['path']
+        elif 'end' in record:
+            contents.end = record
+
+    return contents
+
+@dataclass
+class JournalRecovery:
+    """Состояние прерванного запуска по журналу"""
+    path: Path
+    steps: int = 0
+    done: int = 0           # выполнено (по журналу или по состоянию папки)
+    pending: int = 0        # не выполнено
+    failed: int = 0         # шаги цепочек с ошибкой или откатом - не продолжаются
+    finished: int = 0       # выполнено при восстановлении
+    conflicts: List[str] = field(default_factory=list)
+
+def _recover_chain(steps: List[Dict[str, Any]], outcomes: Dict[int, str], folder: Path,
+                   names: set, report: JournalRecovery,
+                   finished: Optional[List[int]] = None) -> None:
+    """
+    Определяет, докуда дошла цепочка, и при finish выполняет остаток
+
+    Шаги цепочки выполняются строго по порядку, поэтому выполненные шаги -
+    всегда префикс. Целевое имя шага i - исходное имя шага i-1: пока шаг i
+    не выполнен, его целевое имя свободно. Значит, первый шаг со свободным
+    целевым именем - первый невыполненный. Исключение - цикл: после
+    последнего шага временное имя снова свободно, но перенос во временное
+    имя записан в журнал сразу (см. RenameJournal).
+
+    Если передан список finished, оставшиеся шаги выполняются, а номера
+    всех выполненных шагов без записи в журнале добавляются в него.
+    """
+    report.steps += len(steps)
+    if any(outcomes.get(step['seq']) in ('failed', 'undone') for step in steps):
+        report.done += sum(1 for step in steps if outcomes.get(step['seq']) == 'done')
+        report.failed += sum(1 for step in steps if outcomes.get(step['seq']) != 'done')
+        return
+
+    position = 0
+    while position < len(steps) and outcomes.get(steps[position]['seq']) == 'done':
+        position += 1
+    recorded = position
+
+    parked = not steps[0]['final']
+    if parked and position > 0 and steps[0]['target'] not in names:
+        position = len(steps)
+    elif not (parked and position == 0 and steps[0]['target'] not in names):
+        while position < len(steps) and steps[position]['target'] in names:
+            position += 1
+
+    report.done += position
+    remaining = steps[position:]
+    report.pending += len(remaining)
+    if finished is None:
+        return
+
+    # Выполненные шаги, чьи записи потерялись, тоже записываются - по
+    # журналу потом отменяют запуск
+    finished.extend(step['seq'] for step in steps[recorded:position])
+
+    for step in remaining:
+        source, target = step['source'], step['target']
+        if source not in names or target in names:
+            report.conflicts.append(f"{folder / source} -> {target}")
+            return
+        try:
+            os.rename(folder / source, folder / target)
+        except OSError as e:
+            report.conflicts.append(f"{folder / source} -> {target}: {str(e)}")
+            return
+        names.discard(source)
+        names.add(target)
+        finished.append(step['seq'])
+        report.finished += 1
+        report.pending -= 1
+        report.done += 1
+
+def recover_journals(directory: Optional[str] = None, finish: bool = False) -> List[JournalRecovery]:
+    """
+    Находит прерванные запуски и при finish завершает их
+
+    Прерванный запуск - журнал без записи о завершении. Для каждой цепочки
+    определяется выполненная часть (по журналу, а потерянный хвост записей -
+    по состоянию папки). При finish оставшиеся шаги выполняются по порядку,
+    если исходный файл на месте, а целевое имя свободно; иначе цепочка
+    останавливается и попадает в conflicts. Цепочки с ошибкой не
+    продолжаются. Завершенный журнал получает запись о завершении.
+
+    Returns:
+        Отчеты по прерванным журналам
+    """
+    directory = Path(directory or CONFIG['journal']['directory'])
+    if not directory.is_dir():
+        return []
+
+    reports = []
+    for journal_path in sorted(directory.glob('*.jsonl')):
+        try:
+            # Завершенные журналы проверяются по последней строке, без разбора
+            # всего файла - при старте GUI их могут быть сотни тысяч записей
+            if _journal_finished(journal_path):
+                continue
+            contents = read_journal(journal_path)
+        except (OSError, JournalError) as e:
+            logging.warning(f"Журнал пропущен: {journal_path.name} - {str(e)}")
+            continue
+        if contents.end is not None:
+            continue
+
+        report = JournalRecovery(journal_path)
+        finished: Optional[List[int]] = [] if finish else None
+        chains: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for step in contents.steps:
+            chains[step['chain']].append(step)
+
+        listings: Dict[int, set] = {}
+        for chain_steps in chains.values():
+            folder_id = chain_steps[0]['folder']
+            folder = Path(contents.folders[folder_id])
+            if folder_id not in listings:
+                try:
+                    listings[folder_id] = set(os.listdir(folder))
+                except OSError as e:
+                    report.conflicts.append(f"{folder}: {str(e)}")
+                    listings[folder_id] = set()
+            _recover_chain(chain_steps, contents.outcomes, folder,
+                           listings[folder_id], report, finished)
+
+        if finish:
+            with open(journal_path, 'a', encoding='utf-8', newline='\n') as f:
+                f.writelines(_journal_line({'done': seq}) for seq in finished)
+                f.write(_journal_line({
+                    'end': datetime.now().isoformat(timespec='seconds'),
+                    'stats': {
+                        'success': report.done,
+                        'error': report.failed + report.pending,
+                        'recovered': report.finished
+                    }
+                }))
+                f.flush()
+                os.fsync(f.fileno())
+        logging.info(
+            f"Прерванный запуск {journal_path.name}: шагов {report.steps}, "
+            f"выполнено {report.done}, не выполнено {report.pending}, "
+            f"с ошибкой {report.failed}, конфликтов {len(report.conflicts)}"
+            + (f", завершено сейчас {report.finished}" if finish else "")
+        )
+        reports.append(report)
+
+    return reports
+
+def _journal_finished(journal_path: Path) -> bool:
+    """Есть ли в конце журнала запись о завершении"""
+    with open(journal_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 4096))
+        lines = f.read().rstrip(b'\n').split(b'\n')
+    return lines[-1].startswith(b'{"end"')
+
+def _journal_stamps(dry_run: bool) -> bool:
+    """Собирать ли при чтении папки (size, mtime_ns) файлов для журнала"""
+    config = CONFIG['journal']
+    return not dry_run and config['enabled'] and config['stamps']
+
+def _prune_journals(directory: Path, keep: int) -> None:
+    """Удаляет старые завершенные журналы, оставляя keep последних"""
+    journals = sorted(directory.glob('*.jsonl'))
+    for journal_path in journals[:max(0, len(journals) - keep)]:
+        try:
+            if _journal_finished(journal_path):
+                journal_path.unlink()
+        except OSError as e:
+            logging.warning(f"Не удалось удалить журнал {journal_path.name}: {str(e)}")
 
 class FileRenamer:
     """Класс для переименования файлов"""
 
-    def __init__(self, folder_path: str, dry_run: bool = False):
+    def __init__(self, folder_path: str, dry_run: bool = False,
+                 collision_mode: Optional[str] = None, order: Optional[str] = None,
+                 scan: Optional[FolderScan] = None):
         self.folder_path = Path(folder_path)
         self.dry_run = dry_run
-        self.operations: List[RenameOperation] = []
+        self.order = order or CONFIG['file_order']
+        self.operations = OperationTable(self.folder_path)
         self.files: List[Path] = []
-        self._load_files()
+        self.file_names: List[str] = []  # имена self.files (без обращений к Path)
+        # (size, mtime_ns) файлов для журнала: rename их не меняет
+        self.file_stamps: Dict[str, Tuple[int, int]] = {}
+        # Снимок ключей имен всех элементов папки для проверки коллизий без stat
+        self.existing_names: set = set()
+        self.collision_mode = collision_mode
+        self.collision_key: Optional[Callable[[str], str]] = None
+        self.plan_state: Optional[PlanState] = None
+        self._dir_fd: Optional[int] = None  # открыт только во время выполнения
+        self.journal: Optional[RenameJournal] = None
+        self.last_journal: Optional[Path] = None  # журнал последнего выполнения
+
+        if scan is None:
+            self._load_files()
+        else:
+            # Папка уже прочитана (например, рекурсивным обходом)
+            self.collision_key = get_collision_key(self.folder_path, self.collision_mode)
+            self._apply_scan(scan)
 
     def _load_files(self) -> None:
-        """Загружает и сортирует список файлов"""
+        """Загружает файлы одним проходом scandir и сортирует по self.order"""
         if not self.folder_path.exists():
             raise FileNotFoundError(f"Папка не найдена: {self.folder_path}")
 
-        if not self.folder_path.is_dir():
-            raise NotADirectoryError(f"Это не папка: {self.folder_path}")
+        if not self.folder_path.is_dir():
+            raise NotADirectoryError(f"Это не папка: {self.folder_path}")
+
+        self.collision_key = get_collision_key(self.folder_path, self.collision_mode)
+        self._apply_scan(scan_folder(self.folder_path, self.order, self.collision_key,
+                                     stamps=_journal_stamps(self.dry_run)))
+
+        logging.info(f"Загружено {len(self.files)} файлов из {self.folder_path}")
+        if self.collision_key is not None:
+            logging.info("Имена сравниваются без учета регистра и формы Unicode")
+
+    def _apply_scan(self, scan: FolderScan) -> None:
+        """Принимает результат scan_folder как текущее состояние папки"""
+        self.files = scan.files
+        self.file_names = scan.file_names
+        self.existing_names = scan.existing_names
+        self.file_stamps = scan.stamps
+
+    def rescan(self) -> None:
+        """Перечитывает папку; следующий prepare_operations учтет разницу"""
+        self._load_files()
+
+    def get_file_statistics(self) -> Dict[str, int]:
+        """Возвращает статистику по файлам"""
+        extensions = {}
+        for file_path in self.files:
+            ext = file_path.suffix.lower()
+            extensions[ext if ext else '[без расширения]'] = extensions.get(ext, 0) + 1
+        return extensions
+
+    def prepare_operations(self, new_names: List[str], incremental: bool = True) -> OperationTable:
+        """
+        Подготавливает операции переименования с добавлением суффикса _TZ
+
+        При повторном вызове (например, после правки таблицы или rescan())
+        план пересчитывается инкрементально: строки до первого изменения
+        берутся из прошлого плана. Правки отдельных строк без сдвига имен
+        и файлов пересчитывают только строки с затронутыми базовыми именами.
+        """
+        started = time.perf_counter()
+        files_to_process = min(len(self.files), len(new_names))
+        names = list(new_names[:files_to_process])
+        file_names = self.file_names
+
+        state = self.plan_state
+        reused = None
+        if incremental and state is not None and state.key is self.collision_key:
+            reused = self._replan(state, names, file_names)
+
+        if reused is None:
+            self._plan_from(0, names, file_names)
+        else:
+            logging.info(
+                f"Инкрементальное планирование: пересчитано строк {reused} "
+                f"за {time.perf_counter() - started:.2f} с"
+            )
+
+        blocked = block_unresolvable(self.operations, self.collision_key)
+        if blocked:
+            logging.info(f"Заблокировано операций (имя не освободится): {blocked}")
+
+        logging.info(f"Подготовлено {len(self.operations)} операций")
+        return self.operations
+
+    def _plan_from(self, start: int, names: List[str], file_names: List[str]) -> int:
+        """
+        Планирует строки начиная с start, восстанавливая состояние из префикса
+
+        Returns:
+            Число пересчитанных строк
+        """
+        key = self.collision_key or _exact_key
+        state = self.plan_state if start else None
+        count = len(names)
+
+        planner = OperationPlanner(
+            self.folder_path,
+            self.existing_names,
+            movable_names=file_names[:count],
+            collision_key=self.collision_key,
+            table=self.operations if state else None,
+            keep_rows=True
+        )
+
+        if state:
+            table = self.operations
+            table.truncate(start)
+            table.reset_statuses(
+                state.codes[:start],
+                {row: message for row, message in state.errors.items() if row < start}
+            )
+            planner.base_name_counter.update(Counter(state.base_keys[:start]))
+            planner.used_final_names.update(state.stems[:start])
+            planner.existing_names.update(map(key, table.new_names))
+            self._recheck_collisions(state, planner.movable_names, range(start))
+
+        self.operations = planner.plan_many(start + 1, self.files[start:count], names[start:])
+        self._append_skipped(self.operations, count, len(self.files))
+
+        bases = (state.bases[:start] if state else []) + planner.row_bases
+        self.plan_state = PlanState(
+            names=names,
+            file_names=file_names,
+            snapshot=self.existing_names,
+            movable=planner.movable_names,
+            bases=bases,
+            base_keys=bases if self.collision_key is None else list(map(key, bases)),
+            stems=(state.stems[:start] if state else []) + planner.row_stems,
+            codes=array('b', self.operations.statuses),
+            errors=dict(self.operations.errors),
+            # Подборы отброшенного хвоста тоже учтены - оценка с запасом
+            probes=(state.probes if state else 0) + planner.probes,
+            key=self.collision_key
+        )
+        return count - start
+
+    def _replan(self, state: PlanState, names: List[str], file_names: List[str]) -> Optional[int]:
+        """
+        Инкрементально обновляет self.operations относительно state
+
+        Returns:
+            Число пересчитанных строк или None, если нужен полный план
+        """
+        start = min(
+            _first_difference(state.names, names),
+            _first_difference(state.file_names, file_names)
+        )
+        if start == 0:
+            return None
+
+        same_shape = len(names) == len(state.names) and file_names == state.file_names
+        if same_shape and state.probes == 0:
+            recomputed = self._replan_rows(state, names, start)
+            if recomputed is not None:
+                return recomputed
+
+        return self._plan_from(start, names, file_names)
+
+    def _replan_rows(self, state: PlanState, names: List[str], start: int) -> Optional[int]:
+        """
+        Пересчитывает только строки с затронутыми базовыми именами
+
+        Применимо, когда прошлый план обошелся без подбора "{base} ({k}_{j})":
+        тогда итоговое имя строки определяется лишь ее базой и номером
+        вхождения, и правка строки i меняет только строки с той же базой
+        (старой или новой). Если новые имена задевают занятые, возвращает
+        None - тогда пересчитывается весь хвост.
+        """
+        key = self.collision_key or _exact_key
+        edited = list(compress(
+            range(start, len(names)), map(str.__ne__, names[start:], state.names[start:])
+        ))
+        new_bases, _ = plan_duplicate_numbers([names[row] for row in edited])
+
+        bases = list(state.bases)
+        base_keys = list(state.base_keys) if self.collision_key is not None else bases
+        affected = set()
+        for row, base in zip(edited, new_bases):
+            affected.add(state.base_keys[row])
+            bases[row] = base
+            if self.collision_key is not None:
+                base_keys[row] = key(base)
+            affected.add(base_keys[row])
+
+        rows = list(compress(range(len(base_keys)), map(affected.__contains__, base_keys)))
+        stems = list(state.stems)
+        others = set(stems)
+        others.difference_update(stems[row] for row in rows)
+
+        counts: Dict[str, int] = {}
+        updates = []
+        for row in rows:
+            occurrence = counts.get(base_keys[row], 0) + 1
+            counts[base_keys[row]] = occurrence
+            stem = bases[row] if occurrence == 1 else f"{bases[row]} ({occurrence - 1})"
+            stem_key = key(stem)
+            if stem_key in others:
+                return None
+            others.add(stem_key)
+            stems[row] = stem_key
+            updates.append((row, stem, occurrence - 1))
+
+        table = self.operations
+        suffix = CONFIG['file_suffix']
+        codes = array('b', state.codes)
+        errors = dict(state.errors)
+        for row, stem, duplicate_number in updates:
+            new_name = stem + suffix + self.files[row].suffix
+            table.new_names[row] = new_name
+            table.duplicate_numbers[row] = duplicate_number
+            collision = self._is_collision(new_name, table.old_names[row], state.snapshot, state.movable)
+            codes[row] = STATUS_CODES['error' if collision else 'pending']
+            if collision:
+                errors[row] = 'Файл с таким именем уже существует'
+            else:
+                errors.pop(row, None)
+        table.reset_statuses(codes, errors)
+
+        state.names = names
+        state.bases = bases
+        state.base_keys = base_keys
+        state.stems = stems
+        state.codes = codes
+        state.errors = errors
+        self._recheck_collisions(state, state.movable, range(len(names)))
+        return len(updates)
+
+    def _is_collision(self, new_name: str, old_name: str, snapshot: set, movable: set) -> bool:
+        """Занято ли итоговое имя файлом папки, который не переименовывается"""
+        key = self.collision_key or _exact_key
+        target = key(new_name)
+        return target in snapshot and target != key(old_name) and target not in movable
+
+    def _recheck_collisions(self, state: PlanState, movable: set, rows: Iterable[int]) -> None:
+        """
+        Перепроверяет коллизии строк, если изменился снимок папки
+
+        Коллизия строки зависит только от снимка имен папки и набора
+        переименуемых файлов, поэтому проверяются лишь строки, чье итоговое
+        имя входит в разницу старого и нового снимков.
+        """
+        changed = set()
+        if state.snapshot is not self.existing_names:
+            changed |= state.snapshot ^ self.existing_names
+        if state.movable is not movable:
+            changed |= state.movable ^ movable
+        if not changed:
+            return
+
+        key = self.collision_key or _exact_key
+        table = self.operations
+        for row in rows:
+            new_name = table.new_names[row]
+            if not new_name or key(new_name) not in changed:
+                continue
+            collision = self._is_collision(new_name, table.old_names[row], self.existing_names, movable)
+            table.set_status(row, 'error' if collision else 'pending')
+            if collision:
+                table.errors[row] = 'Файл с таким именем уже существует'
+            else:
+                table.errors.pop(row, None)
+            state.codes[row] = table.statuses[row]
+            if collision:
+                state.errors[row] = table.errors[row]
+            else:
+                state.errors.pop(row, None)
+
+        state.snapshot = self.existing_names
+        state.movable = movable
+
+    def _append_skipped(self, table: OperationTable, start: int, stop: int) -> OperationTable:
+        """Дописывает операции для файлов, которым не хватило имен в таблице"""
+        for i in range(start, stop):
+            table.append(i + 1, self.file_names[i], '', 'skipped', 'Не хватило имен в таблице')
+        return table
+
+    def iter_operations(self, name_chunks: Iterable[List[str]],
+                        chunk_size: Optional[int] = None) -> Iterator[OperationTable]:
+        """
+        Потоково строит операции порциями по мере чтения таблицы
+
+        Цепочки и циклы разрешаются внутри порции, как в prepare_operations.
+        Имена файлов прошлых порций, успешно переименованных к моменту
+        планирования следующей (execute_streaming), считаются свободными.
+        Отличие от полного плана: целевое имя, совпадающее с именем файла
+        из еще не прочитанной порции, остается коллизией - заранее
+        неизвестно, будет ли тот файл переименован.
+
+        Args:
+            name_chunks: Порции действительных имен (например, из iter_table_names)
+            chunk_size: Размер выдаваемой порции операций
+
+        Yields:
+            Таблицы операций не длиннее chunk_size (новая на каждую порцию)
+        """
+        chunk_size = chunk_size or CONFIG['pipeline']['chunk_size']
+        key = self.collision_key or _exact_key
+        planner = OperationPlanner(
+            self.folder_path, self.existing_names, collision_key=self.collision_key
+        )
+        targets = set()
+        previous = None
+        position = 0
+
+        for names in name_chunks:
+            for start in range(0, len(names), chunk_size):
+                batch = names[start:start + chunk_size][:len(self.files) - position]
+                if not batch:
+                    break
+                files = self.files[position:position + len(batch)]
+                if previous is not None:
+                    planner.existing_names.difference_update(
+                        key(operation.old_name) for operation in previous.by_status('success')
+                        if key(operation.old_name) not in targets
+                    )
+                planner.table = OperationTable(self.folder_path)
+                planner.movable_names = {key(file_path.name) for file_path in files}
+                previous = planner.plan_many(position + 1, files, batch)
+                block_unresolvable(previous, self.collision_key)
+                targets.update(map(key, previous.new_names))
+                yield previous
+                position += len(batch)
+            if position >= len(self.files):
+                break
+
+        for start in range(position, len(self.files), chunk_size):
+            stop = min(start + chunk_size, len(self.files))
+            yield self._append_skipped(OperationTable(self.folder_path), start, stop)
+
+    def execute_operations(self, workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        Выполняет подготовленные операции переименования
+
+        Args:
+            workers: Число потоков (по умолчанию CONFIG['execution']['workers'])
+        """
+        workers = workers or CONFIG['execution']['workers']
+        stats = {
+            'success': 0,
+            'error': self.operations.count('error'),
+            'skipped': self.operations.count('skipped')
+        }
+
+        chains = order_rename_chains(self.operations, self.existing_names, self.collision_key)
+        cycles = sum(1 for chain in chains if not chain[0].is_final)
+        linked = sum(1 for chain in chains if len(chain) > 1) - cycles
+        if linked or cycles:
+            logging.info(f"Зависимые переименования: цепочек {linked}, циклов {cycles}")
+
+        with self._open_folder(), self._journal_run(stats):
+            self._journal_intend(chains)
+            if workers > 1 and len(chains) > 1:
+                self._execute_chains_parallel(chains, stats, workers)
+            else:
+                for chain in chains:
+                    self._execute_chain(chain, stats)
+
+        return stats
+
+    def _execute_chains_parallel(self, chains: List[List[RenameStep]],
+                                 stats: Dict[str, int], workers: int) -> None:
+        """
+        Выполняет цепочки пулом потоков
+
+        Цепочки не пересекаются по именам, поэтому порядок нужен только
+        внутри цепочки - она целиком уходит одному потоку. В работе не
+        больше workers * 4 цепочек, чтобы не создавать задачу на каждую из
+        сотен тысяч операций сразу.
+        """
+        def run(chain: List[RenameStep]) -> Dict[str, int]:
+            chain_stats = {'success': 0, 'error': 0}
+            self._execute_chain(chain, chain_stats)
+            return chain_stats
+
+        queued = iter(chains)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            running = {pool.submit(run, chain) for chain in islice(queued, workers * 4)}
+            while running:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for status, count in future.result().items():
+                        stats[status] += count
+                running.update(pool.submit(run, chain) for chain in islice(queued, len(done)))
+
+    async def execute_async(self, limit: Optional[int] = None) -> AsyncIterator[RenameOperation]:
+        """
+        Асинхронно выполняет план, отдавая операции по мере завершения
+
+        Системные вызовы выполняются в отдельных потоках, цикл событий не
+        блокируется. Одновременно выполняется не больше limit цепочек, и
+        новые запускаются только когда потребитель забрал результаты -
+        медленный потребитель притормаживает выполнение. Операции с
+        ошибкой или пропуском из плана отдаются сразу. Статусы - как у
+        execute_operations.
+
+        Usage:
+            async for operation in renamer.execute_async(limit=32):
+                ...
+
+        Args:
+            limit: Число одновременных цепочек (по умолчанию
+                CONFIG['execution']['async_limit'])
+        """
+        limit = limit or CONFIG['execution']['async_limit']
+        loop = asyncio.get_running_loop()
+        stats = {
+            'success': 0,
+            'error': self.operations.count('error'),
+            'skipped': self.operations.count('skipped')
+        }
 
-        self.files = [item for item in self.folder_path.iterdir() if item.is_file()]
-        self.files.sort(key=lambda x: x.name.lower())
+        for status in ('error', 'skipped'):
+            for operation in self.operations.by_status(status):
+                yield operation
 
-        logging.info(f"Загружено {len(self.files)} файлов из {self.folder_path}")
+        chains = order_rename_chains(self.operations, self.existing_names, self.collision_key)
+        pool = ThreadPoolExecutor(max_workers=limit)
+        running = {}
 
-    def get_file_statistics(self) -> Dict[str, int]:
-        """Возвращает статистику по файлам"""
-        extensions = {}
-        for file_path in self.files:
-            ext = file_path.suffix.lower()
-            extensions[ext if ext else '[без расширения]'] = extensions.get(ext, 0) + 1
-        return extensions
+        def submit(chain: List[RenameStep]) -> None:
+            chain_stats = {'success': 0, 'error': 0}
+            future = loop.run_in_executor(pool, self._execute_chain, chain, chain_stats)
+            running[future] = (chain, chain_stats)
 
-    def prepare_operations(self, new_names: List[str]) -> List[RenameOperation]:
-        """Подготавливает операции переименования с добавлением суффикса _TZ"""
-        self.operations = []
+        with self._open_folder(), self._journal_run(stats):
+            self._journal_intend(chains)
+            chains = iter(chains)
+            try:
+                for chain in islice(chains, limit):
+                    submit(chain)
+
+                while running:
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        chain, chain_stats = running.pop(future)
+                        future.result()
+                        for status, count in chain_stats.items():
+                            stats[status] += count
+                        for operation in {id(step.operation): step.operation
+                                          for step in chain}.values():
+                            yield operation
+                        # Место освободилось только после того, как потребитель
+                        # забрал результаты цепочки
+                        for next_chain in islice(chains, 1):
+                            submit(next_chain)
+            finally:
+                # Запущенные цепочки не прерываются на середине (иначе цикл
+                # остался бы без отката) - дожидаемся их и при отмене
+                if running:
+                    await asyncio.gather(*running, return_exceptions=True)
+                    # Их итоги попадают в запись о завершении журнала
+                    for _, chain_stats in running.values():
+                        for status, count in chain_stats.items():
+                            stats[status] += count
+                pool.shutdown(wait=False)
+
+        logging.info(
+            f"Асинхронное выполнение завершено: успешно {stats['success']}, "
+            f"ошибок {stats['error']}, пропущено {stats['skipped']}"
+        )
 
-        base_name_counter = defaultdict(int)
-        used_final_names = set()
+    def execute_streaming(self, name_chunks: Iterable[List[str]],
+                          chunk_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        Конвейер: планирование и выполнение порциями без полного плана в памяти
 
-        files_to_process = min(len(self.files), len(new_names))
-        suffix = CONFIG['file_suffix']  # _TZ
+        Первые файлы переименовываются, пока таблица еще читается.
+        В self.operations остаются только операции с ошибками.
+        """
+        stats = {'success': 0, 'error': 0, 'skipped': 0}
+        self.operations = OperationTable(self.folder_path)
+
+        with self._open_folder(), self._journal_run(stats):
+            for chunk in self.iter_operations(name_chunks, chunk_size):
+                stats['error'] += chunk.count('error')
+                stats['skipped'] += chunk.count('skipped')
+                chains = order_rename_chains(chunk, self.existing_names, self.collision_key)
+                self._journal_intend(chains)
+                for chain in chains:
+                    self._execute_chain(chain, stats)
+                for operation in chunk.by_status('error'):
+                    self.operations.append(
+                        operation.index, operation.old_name, operation.new_name, 'error',
+                        operation.error_message, operation.duplicate_number
+                    )
+
+        logging.info(
+            f"Потоковое выполнение завершено: успешно {stats['success']}, "
+            f"ошибок {stats['error']}, пропущено {stats['skipped']}"
+        )
+        return stats
 
-        for i in range(files_to_process):
-            file_path = self.files[i]
-            original_name = new_names[i]
+    def _execute_chain(self, chain: List[RenameStep], stats: Dict[str, int]) -> None:
+        """
+        Выполняет цепочку шагов по порядку
 
-            base_name = extract_base_name(original_name)
-            original_extension = file_path.suffix
+        После сбоя оставшиеся операции цепочки не выполняются (их целевые
+        имена не освободились). Если цепочка - разорванный цикл и она не
+        завершилась, выполненные шаги откатываются, а файл из временного
+        имени возвращается на место - даже при неожиданном исключении.
+        """
+        parked = chain[0] if not chain[0].is_final else None
+        done: List[RenameStep] = []
+        failed = False
 
-            base_name_counter[base_name] += 1
+        try:
+            for step in chain:
+                if failed:
+                    if step.operation.status == 'pending':
+                        step.operation.status = 'error'
+                        step.operation.error_message = (
+                            'Не выполнено: не удалось предыдущее переименование в цепочке'
+                        )
+                    continue
+
+                if self._run_step(step):
+                    done.append(step)
+                else:
+                    failed = True
+        finally:
+            if parked is not None and parked.operation.status != 'success' and parked in done:
+                self._rollback_cycle(done)
 
-            is_duplicate = False
-            duplicate_num = None
+        for operation in {id(step.operation): step.operation for step in chain}.values():
+            stats['success' if operation.status == 'success' else 'error'] += 1
 
-            if base_name_counter[base_name] == 1:
-                final_base_name = base_name
-            else:
-                final_base_name = f"{base_name} ({base_name_counter[base_name] - 1})"
-                is_duplicate = True
-                duplicate_num = base_name_counter[base_name] - 1
+    def _run_step(self, step: RenameStep) -> bool:
+        """Выполняет один шаг; при ошибке помечает операцию и возвращает False"""
+        operation = step.operation
+        try:
+            if self.dry_run:
+                if step.is_final:
+                    operation.status = 'success'
+                    logging.info(f"[DRY RUN] {operation.old_name} -> {operation.new_name}")
+                return True
 
-            temp_final_name = final_base_name
-            suffix_counter = 1
-            while temp_final_name in used_final_names:
-                temp_final_name = f"{base_name} ({base_name_counter[base_name] - 1}_{suffix_counter})"
-                suffix_counter += 1
+            self._rename(step.source, step.target)
+
+        except PermissionError as e:
+            operation.status = 'error'
+            operation.error_message = f"Нет доступа: {str(e)}"
+            logging.error(f"Ошибка доступа: {operation.old_name}")
 
-            final_name_without_ext = temp_final_name
+        except OSError as e:
+            operation.status = 'error'
+            operation.error_message = f"Ошибка ОС: {str(e)}"
+            logging.error(f"Ошибка ОС: {operation.old_name} - {str(e)}")
 
-            # ДОБАВЛЯЕМ СУФФИКС _TZ ПЕРЕД РАСШИРЕНИЕМ
-            final_name_with_ext = final_name_without_ext + suffix + original_extension
+        except Exception as e:
+            operation.status = 'error'
+            operation.error_message = str(e)
+            logging.error(f"Неожиданная ошибка: {operation.old_name} - {str(e)}")
+
+        else:
+            # Файл уже переименован: ошибка записи журнала не делает шаг
+            # неудачным (иначе откат цикла перезаписал бы занятое имя)
+            if step.is_final:
+                operation.status = 'success'
+                logging.info(f"Переименован: {operation.old_name} -> {operation.new_name}")
+            else:
+                logging.debug(f"Временное имя: {step.source} -> {step.target}")
+            if self.journal is not None:
+                # rename не меняет size и mtime: отметка берется из чтения папки
+                stamp = self.file_stamps.get(operation.old_name) if step.is_final else None
+                self._journal_write('done', step, stamp)
+            return True
+
+        if self.journal is not None:
+            self._journal_write('failed', step, operation.error_message)
+        return False
+
+    def _journal_write(self, record: str, *args: Any) -> None:
+        """Пишет исход шага в журнал (done/failed/undone); ошибка журнала только логируется"""
+        try:
+            getattr(self.journal, record)(*args)
+        except OSError as e:
+            logging.error(f"Ошибка записи журнала {self.journal.path}: {str(e)}")
+
+    @contextmanager
+    def _open_folder(self) -> Iterator[None]:
+        """
+        Держит папку открытой на время выполнения плана
+
+        Пока дескриптор открыт, _rename передает ядру только имена файлов:
+        полный путь папки не разбирается заново на каждом вызове (на
+        глубоких и сетевых путях это заметно), а перемещение папки во
+        время выполнения не ломает переименования. Где rename не
+        поддерживает dir_fd (Windows), используются полные пути.
+        """
+        if self.dry_run or self._dir_fd is not None or not (
+                CONFIG['execution']['dir_fd'] and DIR_FD_RENAME):
+            yield
+            return
 
-            used_final_names.add(final_name_without_ext)
+        self._dir_fd = os.open(self.folder_path, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+        try:
+            yield
+        finally:
+            os.close(self._dir_fd)
+            self._dir_fd = None
+
+    @contextmanager
+    def _journal_run(self, stats: Dict[str, int]) -> Iterator[None]:
+        """
+        Ведет журнал выполнения, если он включен и не задан извне
+
+        Запись о завершении (с итогами stats) добавляется при нормальном
+        выходе и при остановке потребителем execute_async; журнал без нее
+        (исключение, сбой процесса) считается прерванным запуском.
+        """
+        if self.dry_run or self.journal is not None or not CONFIG['journal']['enabled']:
+            yield
+            return
 
-            new_path = self.folder_path / final_name_with_ext
+        self.journal = RenameJournal()
+        self.last_journal = self.journal.path
+        logging.info(f"Журнал выполнения: {self.journal.path}")
+        try:
+            yield
+        except GeneratorExit:
+            self.journal.close(stats)
+            raise
+        except BaseException:
+            self.journal.close()
+            raise
+        else:
+            self.journal.close(stats)
+        finally:
+            self.journal = None
 
-            if new_path.exists() and new_path != file_path:
-                operation = RenameOperation(
-                    index=i + 1,
-                    old_path=file_path,
-                    new_name=final_name_with_ext,
-                    status='error',
-                    error_message='Файл с таким именем уже существует',
-                    is_duplicate=is_duplicate,
-                    duplicate_number=duplicate_num
-                )
+    def _exists(self, name: str) -> bool:
+        """Есть ли в папке файл (или ссылка) с таким именем"""
+        try:
+            if self._dir_fd is not None:
+                os.stat(name, dir_fd=self._dir_fd, follow_symlinks=False)
             else:
-                operation = RenameOperation(
-                    index=i + 1,
-                    old_path=file_path,
-                    new_name=final_name_with_ext,
-                    status='pending',
-                    is_duplicate=is_duplicate,
-                    duplicate_number=duplicate_num
+                os.lstat(self.folder_path / name)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _journal_intend(self, chains: List[List[RenameStep]]) -> None:
+        if self.journal is not None and chains:
+            self.journal.intend(self.folder_path, chains)
+
+    def _rename(self, source: str, target: str) -> None:
+        """Переименовывает файл внутри папки (имена без пути)"""
+        if self._dir_fd is not None:
+            os.rename(source, target, src_dir_fd=self._dir_fd, dst_dir_fd=self._dir_fd)
+        else:
+            os.rename(self.folder_path / source, self.folder_path / target)
+
+    def _rollback_cycle(self, done: List[RenameStep]) -> None:
+        """Откатывает выполненные шаги незавершенного цикла в обратном порядке"""
+        if self.dry_run:
+            return
+
+        key = self.collision_key or _exact_key
+        for step in reversed(done):
+            try:
+                # rename на POSIX молча заменяет существующий файл: занятое
+                # прежнее имя проверяется заранее (кроме смены регистра)
+                if key(step.source) != key(step.target) and self._exists(step.source):
+                    raise FileExistsError(f"Имя занято: {step.source}")
+                self._rename(step.target, step.source)
+            except OSError as e:
+                # Имя step.source еще занято: откат предыдущих шагов
+                # перезаписал бы файл, поэтому останавливаемся
+                logging.error(
+                    f"Не удалось откатить {step.target} -> {step.source}: {str(e)}"
                 )
+                break
 
-            self.operations.append(operation)
+            if self.journal is not None:
+                self._journal_write('undone', step)
+            operation = step.operation
+            if step.is_final and operation.status == 'success':
+                operation.status = 'error'
+                operation.error_message = 'Отменено: цикл переименований не завершен'
+            logging.warning(f"Откат: {step.target} -> {step.source}")
+
+    def save_plan(self, plan_path: str) -> int:
+        """
+        Сохраняет текущий план в файл JSON Lines
+
+        Для каждого исходного файла записывается (dev, inode, size,
+        mtime_ns), чтобы при выполнении плана заметить изменения папки.
+        Операции, успешно выполненные в режиме предпросмотра, сохраняются
+        как ожидающие.
+
+        Returns:
+            Число операций, ожидающих выполнения
+        """
+        plan_path = Path(plan_path)
+        header = {
+            'format': PLAN_FORMAT,
+            'version': PLAN_VERSION,
+            'folder': str(self.folder_path.resolve()),
+            'host': platform.node(),
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'suffix': CONFIG['file_suffix'],
+            'collision_mode': 'exact' if self.collision_key is None else 'casefold',
+            'count': len(self.operations),
+            'fields': PLAN_FIELDS
+        }
 
-        for i in range(files_to_process, len(self.files)):
-            operation = RenameOperation(
-                index=i + 1,
-                old_path=self.files[i],
-                new_name='',
-                status='skipped',
-                error_message='Не хватило имен в таблице'
+        pending = 0
+        temp_path = plan_path.with_name(plan_path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(json.dumps(header, ensure_ascii=False) + '\n')
+            for op in self.operations:
+                status = op.status
+                if status == 'success' and self.dry_run:
+                    status = 'pending'
+
+                stamp = [None, None, None, None]
+                error = op.error_message
+                if status == 'pending':
+                    try:
+                        st = os.stat(op.old_path)
+                        stamp = [st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns]
+                        pending += 1
+                    except OSError as e:
+                        status, error = 'error', f"Ошибка ОС: {str(e)}"
+
+                row = [op.index, op.old_name, op.new_name, status, error,
+                       op.duplicate_number or 0] + stamp
+                f.write(json.dumps(row, ensure_ascii=False) + '\n')
+        os.replace(temp_path, plan_path)
+
+        logging.info(f"План сохранен: {plan_path} ({len(self.operations)} операций)")
+        return pending
+
+    @staticmethod
+    def read_plan_header(plan_path: str) -> Dict[str, Any]:
+        """
+        Читает заголовок сохраненного плана (папка, хост, число операций)
+
+        Raises:
+            PlanError: Файл не является планом или версия не поддерживается
+        """
+        plan_path = Path(plan_path)
+        with open(plan_path, encoding='utf-8') as f:
+            return _parse_plan_header(f.readline(), plan_path.name)
+
+    @classmethod
+    def load_plan(cls, plan_path: str, dry_run: bool = False,
+                  folder: Optional[str] = None) -> 'FileRenamer':
+        """
+        Загружает сохраненный план без повторного планирования
+
+        Папка сканируется один раз; каждый исходный файл сверяется с
+        записанными (dev, inode, size, mtime_ns) одним stat. Если план
+        создан на другом компьютере, dev/inode не сравниваются (у сетевой
+        папки они свои на каждой машине). Устаревшие операции помечаются
+        ошибкой, остальные выполняются через execute_operations().
+
+        Args:
+            folder: Папка с файлами вместо записанной в плане (папка
+                перенесена, диск подключен под другой буквой). dev/inode
+                тогда не сравниваются, только размер и время изменения.
+
+        Raises:
+            PlanError: Файл не является планом или поврежден
+        """
+        plan_path = Path(plan_path)
+        with open(plan_path, encoding='utf-8') as f:
+            header = _parse_plan_header(f.readline(), plan_path.name)
+            relocated = folder is not None and os.path.normcase(
+                os.path.realpath(folder)) != os.path.normcase(header['folder'])
+
+            renamer = cls(folder if folder is not None else header['folder'], dry_run=dry_run,
+                          collision_mode=header.get('collision_mode'))
+            table = OperationTable(renamer.folder_path)
+            stamps: Dict[int, Tuple[int, int, int, int]] = {}
+
+            for line_number, line in enumerate(f, 2):
+                try:
+                    (index, old_name, new_name, status, error, duplicate,
+                     dev, inode, size, mtime_ns) = json.loads(line)
+                    if status == 'success':
+                        status, error = 'skipped', 'Выполнено ранее'
+                    row = table.append(index, old_name, new_name, status, error, duplicate)
+                except (ValueError, TypeError) as e:
+                    raise PlanError(f"План поврежден (строка {line_number}): {str(e)}")
+                if status == 'pending':
+                    stamps[row] = (dev, inode, size, mtime_ns)
+
+        if len(table) != header.get('count'):
+            raise PlanError(
+                f"План неполный: {len(table)} операций из {header.get('count')}"
             )
-            self.operations.append(operation)
-
-        logging.info(f"Подготовлено {len(self.operations)} операций")
-        return self.operations
 
-    def execute_operations(self) -> Dict[str, int]:
-        """Выполняет подготовленные операции переименования"""
-        stats = {'success': 0, 'error': 0, 'skipped': 0}
+        renamer.operations = table
+        same_host = header.get('host') == platform.node()
+        stale = renamer._validate_plan(stamps, check_inode=same_host and not relocated)
 
-        for operation in self.operations:
-            if operation.status == 'skipped':
-                stats['skipped'] += 1
+        logging.info(
+            f"Загружен план {plan_path.name}: {len(table)} операций, "
+            f"ожидают {table.count('pending')}, устарело {stale}"
+        )
+        return renamer
+
+    def _validate_plan(self, stamps: Dict[int, Tuple[int, int, int, int]],
+                       check_inode: bool = True) -> int:
+        """
+        Сверяет ожидающие операции загруженного плана с папкой
+
+        Returns:
+            Число операций, помеченных ошибкой
+        """
+        key = self.collision_key or _exact_key
+        table = self.operations
+        sources = {key(op.old_name) for op in table.by_status('pending')}
+        stale = 0
+
+        for op in table.by_status('pending'):
+            try:
+                st = os.stat(op.old_path)
+            except FileNotFoundError:
+                op.status = 'error'
+                op.error_message = 'Файл не найден (папка изменилась после планирования)'
+                stale += 1
+                continue
+            except OSError as e:
+                op.status = 'error'
+                op.error_message = f"Ошибка ОС: {str(e)}"
+                stale += 1
                 continue
 
-            if operation.status == 'error':
-                stats['error'] += 1
+            self.file_stamps[op.old_name] = (st.st_size, st.st_mtime_ns)
+            dev, inode, size, mtime_ns = stamps[op.row]
+            if (st.st_size, st.st_mtime_ns) != (size, mtime_ns) or (
+                    check_inode and (st.st_dev, st.st_ino) != (dev, inode)):
+                op.status = 'error'
+                op.error_message = 'Файл изменился после планирования'
+                stale += 1
                 continue
 
-            try:
-                new_path = self.folder_path / operation.new_name
+            target = key(op.new_name)
+            if target in self.existing_names and target != key(op.old_name) and target not in sources:
+                op.status = 'error'
+                op.error_message = 'Файл с таким именем уже существует'
+                stale += 1
 
-                if self.dry_run:
-                    operation.status = 'success'
-                    logging.info(f"[DRY RUN] {operation.old_path.name} -> {operation.new_name}")
-                else:
-                    operation.old_path.rename(new_path)
-                    operation.status = 'success'
-                    logging.info(f"Переименован: {operation.old_path.name} -> {operation.new_name}")
+        return stale + block_unresolvable(table, self.collision_key)
 
-                stats['success'] += 1
+    def get_operations_by_status(self, status: str) -> List[RenameOperation]:
+        """Возвращает операции с заданным статусом"""
+        return self.operations.by_status(status)
 
-            except PermissionError as e:
-                operation.status = 'error'
-                operation.error_message = f"Нет доступа: {str(e)}"
-                stats['error'] += 1
-                logging.error(f"Ошибка доступа: {operation.old_path.name}")
+    def get_duplicate_operations(self) -> List[RenameOperation]:
+        """Возвращает операции с дубликатами"""
+        return self.operations.duplicates()
 
-            except OSError as e:
-                operation.status = 'error'
-                operation.error_message = f"Ошибка ОС: {str(e)}"
-                stats['error'] += 1
-                logging.error(f"Ошибка ОС: {operation.old_path.name} - {str(e)}")
+class TreeRenamer:
+    """
+    Рекурсивное переименование: отдельный FileRenamer на каждую папку дерева
+
+    Дерево читается параллельным обходом (walk_folders), папки упорядочены
+    по относительному пути. Сопоставление с таблицей:
+      'global'        - строки таблицы расходуются папками подряд;
+      'per_directory' - каждая папка получает таблицу с первой строки.
+    Номера дубликатов и коллизии считаются внутри каждой папки: одинаковые
+    имена в разных папках не конфликтуют. Планирование и выполнение идут
+    по папкам параллельно - каждая задача трогает только свою папку.
+    """
 
-            except Exception as e:
-                operation.status = 'error'
-                operation.error_message = str(e)
-                stats['error'] += 1
-                logging.error(f"Неожиданная ошибка: {operation.old_path.name} - {str(e)}")
+    MAPPINGS = ('global', 'per_directory')
+
+    def __init__(self, root_path: str, dry_run: bool = False,
+                 mapping: Optional[str] = None, order: Optional[str] = None,
+                 collision_mode: Optional[str] = None, workers: Optional[int] = None,
+                 renamers: Optional[List[FileRenamer]] = None):
+        self.root_path = Path(root_path)
+        self.dry_run = dry_run
+        self.mapping = mapping or CONFIG['recursive']['mapping']
+        if self.mapping not in self.MAPPINGS:
+            raise ValueError(f"Неизвестное сопоставление таблицы: {self.mapping}")
+        self.order = order or CONFIG['file_order']
+        self.workers = workers or CONFIG['recursive']['workers']
+        self.collision_mode = collision_mode
+        self.renamers: List[FileRenamer] = []
+        self.folder_count = 0
+        self.last_journal: Optional[Path] = None
+
+        if renamers is None:
+            self._load_tree()
+        else:
+            # Папки уже подготовлены (например, отмена запуска по журналу)
+            self.renamers = renamers
+            self.folder_count = len(renamers)
+
+    def _load_tree(self) -> None:
+        """Параллельно читает дерево и создает FileRenamer для папок с файлами"""
+        if not self.root_path.is_dir():
+            raise NotADirectoryError(f"Это не папка: {self.root_path}")
+
+        # Файловая система определяется один раз - по корню дерева
+        collision_key = get_collision_key(self.root_path, self.collision_mode)
+        mode = 'exact' if collision_key is None else 'casefold'
+
+        started = time.perf_counter()
+        scans = walk_folders(self.root_path, self.order, collision_key, self.workers,
+                             stamps=_journal_stamps(self.dry_run))
+        elapsed = time.perf_counter() - started
+
+        root = self.root_path
+        scans.sort(key=lambda scan: [part.lower() for part in scan.path.relative_to(root).parts])
+        self.folder_count = len(scans)
+        self.renamers = [
+            FileRenamer(scan.path, dry_run=self.dry_run, collision_mode=mode,
+                        order=self.order, scan=scan)
+            for scan in scans if scan.files
+        ]
+
+        logging.info(
+            f"Просканировано папок: {self.folder_count} за {elapsed:.2f} с "
+            f"({self.folder_count / elapsed if elapsed > 0 else 0:.0f} папок/с), "
+            f"с файлами: {len(self.renamers)}, файлов: {self.total_files}"
+        )
+
+    @property
+    def total_files(self) -> int:
+        return sum(len(renamer.files) for renamer in self.renamers)
+
+    def _name_slices(self, new_names: List[str]) -> List[List[str]]:
+        """Имена таблицы для каждой папки согласно self.mapping"""
+        if self.mapping == 'per_directory':
+            return [new_names] * len(self.renamers)
+
+        slices = []
+        position = 0
+        for renamer in self.renamers:
+            slices.append(new_names[position:position + len(renamer.files)])
+            position += len(renamer.files)
+        return slices
+
+    def prepare_operations(self, new_names: List[str]) -> int:
+        """
+        Параллельно планирует переименование во всех папках
+
+        Returns:
+            Общее число операций
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(
+                lambda job: job[0].prepare_operations(job[1]),
+                zip(self.renamers, self._name_slices(new_names))
+            ))
+
+        total = sum(len(renamer.operations) for renamer in self.renamers)
+        logging.info(f"Подготовлено {total} операций в {len(self.renamers)} папках")
+        return total
+
+    def count(self, status: str) -> int:
+        """Число операций со статусом status во всех папках"""
+        return sum(renamer.operations.count(status) for renamer in self.renamers)
+
+    def execute_operations(self, folder_workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        Параллельно выполняет планы всех папок, возвращает общую статистику
+
+        Args:
+            folder_workers: Потоков внутри каждой папки (см.
+                FileRenamer.execute_operations)
+        """
+        stats = {'success': 0, 'error': 0, 'skipped': 0}
+        started = time.perf_counter()
+
+        # Один журнал на все дерево вместо журнала на каждую папку
+        journal = None
+        if not self.dry_run and CONFIG['journal']['enabled']:
+            journal = RenameJournal()
+            self.last_journal = journal.path
+            logging.info(f"Журнал выполнения: {journal.path}")
+        for renamer in self.renamers:
+            renamer.journal = journal
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for folder_stats in pool.map(
+                    lambda renamer: renamer.execute_operations(folder_workers), self.renamers
+                ):
+                    for status, count in folder_stats.items():
+                        stats[status] += count
+        except BaseException:
+            if journal is not None:
+                journal.close()
+            raise
+        else:
+            if journal is not None:
+                journal.close(stats)
+        finally:
+            for renamer in self.renamers:
+                renamer.journal = None
 
+        elapsed = time.perf_counter() - started
+        logging.info(
+            f"Обработано папок: {len(self.renamers)} за {elapsed:.2f} с "
+            f"({len(self.renamers) / elapsed if elapsed > 0 else 0:.0f} папок/с)"
+        )
         return stats
 
-    def get_operations_by_status(self, status: str) -> List[RenameOperation]:
-        """Возвращает операции с заданным статусом"""
-        return [op for op in self.operations if op.status == status]
+def load_undo(journal_path: str, dry_run: bool = False,
+              workers: Optional[int] = None) -> TreeRenamer:
+    """
+    Готовит отмену завершенного запуска по его журналу
 
-    def get_duplicate_operations(self) -> List[RenameOperation]:
-        """Возвращает операции с дубликатами"""
-        return [op for op in self.operations if op.is_duplicate]
+    Каждая выполненная (и не откаченная) операция журнала становится
+    обратной операцией: итоговое имя -> исходное. Обратные операции
+    упорядочиваются как обычный план (order_rename_chains): цепочки и циклы
+    исходного запуска разворачиваются в обратную сторону. Ошибкой
+    помечаются операции, если файла с итоговым именем нет, если его размер
+    или время изменения отличаются от записанных после переименования,
+    или если исходное имя заняло файл, не участвующий в отмене.
+
+    Returns:
+        TreeRenamer с FileRenamer на каждую папку запуска
+
+    Raises:
+        JournalError: Файл не является журналом или запуск не завершен
+    """
+    contents = read_journal(journal_path)
+    if contents.end is None:
+        raise JournalError(
+            f"Запуск {Path(journal_path).name} не завершен - сначала завершите его восстановлением"
+        )
+
+    # Операция исходного запуска - шаги одной цепочки с одним индексом:
+    # первый шаг начинается с исходного имени, последний итоговый - с
+    # итогового (в цикле между ними временное имя)
+    operations: Dict[Tuple[int, int, int], List[Dict[str, Any]]] = {}
+    for step in contents.steps:
+        operations.setdefault((step['folder'], step['chain'], step['index']), []).append(step)
+
+    moves: Dict[int, List[Tuple[int, str, str, Optional[Tuple[int, int]]]]] = defaultdict(list)
+    for (folder_id, _, index), steps in operations.items():
+        final = steps[-1]
+        if final['final'] and contents.outcomes.get(final['seq']) == 'done':
+            moves[folder_id].append(
+                (index, final['target'], steps[0]['source'], contents.stamps.get(final['seq']))
+            )
+
+    renamers = [
+        _undo_renamer(Path(contents.folders[folder_id]), folder_moves, dry_run)
+        for folder_id, folder_moves in sorted(moves.items())
+    ]
+    root = os.path.commonpath([str(renamer.folder_path) for renamer in renamers]) if renamers else '.'
+    undo = TreeRenamer(root, dry_run=dry_run, workers=workers, renamers=renamers)
+
+    logging.info(
+        f"Отмена запуска {Path(journal_path).name}: папок {len(renamers)}, "
+        f"операций {sum(len(renamer.operations) for renamer in renamers)}, "
+        f"выполнимо {undo.count('pending')}, конфликтов {undo.count('error')}"
+    )
+    return undo
+
+def _undo_renamer(folder: Path, moves: List[Tuple[int, str, str, Optional[Tuple[int, int]]]],
+                  dry_run: bool) -> FileRenamer:
+    """FileRenamer с обратными операциями для одной папки (см. load_undo)"""
+    renamer = FileRenamer(folder, dry_run=dry_run)
+    key = renamer.collision_key or _exact_key
+    present = set(renamer.file_names)
+    table = OperationTable(renamer.folder_path)
+    folder_name = str(folder)
+
+    missing = []
+    for index, current, original, stamp in sorted(moves):
+        status, error = 'pending', None
+        if current not in present:
+            # Имени нет в папке - оно никого не блокирует (добавляется в конце)
+            missing.append((index, current, original))
+            continue
+        if stamp is not None:
+            try:
+                st = os.stat(os.path.join(folder_name, current))
+                if (st.st_size, st.st_mtime_ns) != tuple(stamp):
+                    status, error = 'error', 'Файл изменен после запуска'
+            except OSError as e:
+                status, error = 'error', f"Ошибка ОС: {str(e)}"
+        table.append(index, current, original, status, error)
+
+    # Исходное имя должно быть свободно или освобождаться самой отменой
+    moving = {key(name) for name in table.old_names}
+    for operation in table.by_status('pending'):
+        target = key(operation.new_name)
+        if target in renamer.existing_names and target not in moving:
+            operation.status = 'error'
+            operation.error_message = 'Исходное имя занято другим файлом'
+
+    block_unresolvable(table, renamer.collision_key)
+    for index, current, original in missing:
+        table.append(index, current, original, 'error',
+                     'Файл не найден (переименован или удален после запуска)')
+    renamer.operations = table
+    return renamer
+
+def undo_run(journal_path: str, dry_run: bool = False,
+             workers: Optional[int] = None) -> Tuple[TreeRenamer, Dict[str, int]]:
+    """
+    Отменяет завершенный запуск по журналу
+
+    Папки обрабатываются параллельно; если папка одна, параллельно
+    выполняются ее цепочки. Сама отмена тоже пишет журнал, так что ее
+    можно восстановить после сбоя и отменить.
+
+    Returns:
+        (подготовленная отмена, статистика выполнения)
+    """
+    workers = workers or CONFIG['undo']['workers']
+    undo = load_undo(journal_path, dry_run=dry_run, workers=workers)
+    folder_workers = workers if len(undo.renamers) == 1 else 1
+    return undo, undo.execute_operations(folder_workers)
 
 # ============================================================================
 # НАСТРОЙКА ЛОГИРОВАНИЯ
@@ -483,6 +3484,24 @@ def setup_logging():
 class FileRenamerGUI:
     """Графический интерфейс для переименования файлов"""
 
+    # Режимы строки заголовка: подпись -> параметр has_header
+    HEADER_MODES = {'Авто': None, 'Есть': True, 'Нет': False}
+
+    # Порядок файлов: подпись -> ключ FILE_ORDERS
+    FILE_ORDER_MODES = {
+        'По имени': 'name',
+        'Естественный (2 < 10)': 'natural',
+        'По алфавиту (ё после е)': 'locale',
+        'По дате изменения': 'mtime',
+        'По размеру': 'size'
+    }
+
+    # Сопоставление таблицы в рекурсивном режиме: подпись -> TreeRenamer.MAPPINGS
+    RECURSIVE_MAPPINGS = {
+        'Одна таблица на все дерево': 'global',
+        'Таблица для каждой папки': 'per_directory'
+    }
+
     def __init__(self, root: tk.Tk):
         self.root = root
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -493,9 +3512,25 @@ class FileRenamerGUI:
         self.table_path = tk.StringVar()
         self.folder_path = tk.StringVar()
         self.dry_run_var = tk.BooleanVar(value=CONFIG['dry_run']['default'])
+        self.streaming_var = tk.BooleanVar(value=False)
+        self.recursive_var = tk.BooleanVar(value=False)
+        self.mapping_var = tk.StringVar(value=next(
+            label for label, mapping in self.RECURSIVE_MAPPINGS.items()
+            if mapping == CONFIG['recursive']['mapping']
+        ))
+        self.sheet_var = tk.StringVar()
+        self.column_var = tk.StringVar(value="A")
+        self.header_var = tk.StringVar(value="Авто")
+        self.order_var = tk.StringVar(value=next(
+            label for label, order in self.FILE_ORDER_MODES.items()
+            if order == CONFIG['file_order']
+        ))
         self.status_var = tk.StringVar(value="Готов к работе")
 
         # Процессоры
+        self.table_cache: Optional[TableCache] = (
+            TableCache() if CONFIG['table_cache']['enabled'] else None
+        )
         self.table_processor: Optional[TableProcessor] = None
         self.file_renamer: Optional[FileRenamer] = None
 
@@ -507,6 +3542,9 @@ class FileRenamerGUI:
 
         self.logger.info("GUI инициализирован")
 
+        # Прерванные запуски проверяются, когда окно уже показано
+        self.root.after(200, self._check_interrupted_runs)
+
     def _setup_window(self) -> None:
         """Настройка главного окна"""
         window_config = CONFIG['window']
@@ -571,11 +3609,11 @@ class FileRenamerGUI:
 
         info_text = (
             "📋 ФОРМАТ РАБОТЫ:\n"
-            "1. Файлы сортируются ПО АЛФАВИТУ (A-Z, А-Я)\n"
+            "1. Файлы сортируются в выбранном порядке (по умолчанию - по имени)\n"
             "2. Первый файл → первое имя из таблицы\n"
             "3. 🔄 ДУБЛИКАТЫ: первый раз без номера, затем (1), (2), ...\n"
             "4. 📎 К имени добавляется _TZ перед расширением\n"
-            "5. ❗ В таблице НЕТ строки заголовка (данные с 1-й строки)\n"
+            "5. 📋 Строка заголовка определяется автоматически (можно задать явно)\n"
             "6. ✨ Недопустимые символы заменяются на '_'"
         )
 
@@ -594,7 +3632,7 @@ class FileRenamerGUI:
         """Создает секцию выбора таблицы"""
         table_frame = ttk.LabelFrame(
             self.root,
-            text="1. Выберите таблицу (без строки заголовка)"
+            text="1. Выберите таблицу"
         )
         table_frame.pack(fill="x", padx=20, pady=10)
 
@@ -616,6 +3654,35 @@ class FileRenamerGUI:
             width=10
         ).grid(row=0, column=2, padx=5, pady=5)
 
+        # Выбор листа и столбца с именами
+        select_frame = ttk.Frame(table_frame)
+        select_frame.grid(row=1, column=0, columnspan=3, padx=5, pady=(0, 5), sticky="w")
+
+        ttk.Label(select_frame, text="Лист:").pack(side="left")
+        self.sheet_combo = ttk.Combobox(
+            select_frame,
+            textvariable=self.sheet_var,
+            state="readonly",
+            width=25
+        )
+        self.sheet_combo.pack(side="left", padx=(5, 15))
+
+        ttk.Label(select_frame, text="Столбец (A, 4 или заголовок):").pack(side="left")
+        ttk.Entry(
+            select_frame,
+            textvariable=self.column_var,
+            width=20
+        ).pack(side="left", padx=(5, 15))
+
+        ttk.Label(select_frame, text="Заголовок:").pack(side="left")
+        ttk.Combobox(
+            select_frame,
+            textvariable=self.header_var,
+            values=list(self.HEADER_MODES),
+            state="readonly",
+            width=6
+        ).pack(side="left", padx=5)
+
     def _create_folder_section(self) -> None:
         """Создает секцию выбора папки"""
         folder_frame = ttk.LabelFrame(
@@ -642,6 +3709,18 @@ class FileRenamerGUI:
             width=10
         ).grid(row=0, column=2, padx=5, pady=5)
 
+        ttk.Label(folder_frame, text="Порядок файлов:").grid(
+            row=1, column=0, padx=5, pady=(0, 5), sticky="w"
+        )
+
+        ttk.Combobox(
+            folder_frame,
+            textvariable=self.order_var,
+            values=list(self.FILE_ORDER_MODES),
+            state="readonly",
+            width=25
+        ).grid(row=1, column=1, padx=5, pady=(0, 5), sticky="w")
+
     def _create_options_section(self) -> None:
         """Создает секцию опций"""
         options_frame = ttk.LabelFrame(self.root, text="3. Опции")
@@ -654,6 +3733,30 @@ class FileRenamerGUI:
         )
         dry_run_check.pack(padx=10, pady=5, anchor="w")
 
+        streaming_check = ttk.Checkbutton(
+            options_frame,
+            text="⚡ Потоковый режим - переименование начинается во время чтения таблицы",
+            variable=self.streaming_var
+        )
+        streaming_check.pack(padx=10, pady=(0, 5), anchor="w")
+
+        recursive_frame = ttk.Frame(options_frame)
+        recursive_frame.pack(padx=10, pady=(0, 5), anchor="w")
+
+        ttk.Checkbutton(
+            recursive_frame,
+            text="📂 Включая вложенные папки:",
+            variable=self.recursive_var
+        ).pack(side="left")
+
+        ttk.Combobox(
+            recursive_frame,
+            textvariable=self.mapping_var,
+            values=list(self.RECURSIVE_MAPPINGS),
+            state="readonly",
+            width=28
+        ).pack(side="left", padx=5)
+
         # Информация о суффиксе
         suffix_label = tk.Label(
             options_frame,
@@ -684,6 +3787,33 @@ class FileRenamerGUI:
         )
         self.preview_button.pack(side="left", padx=5)
 
+        plan_frame = tk.Frame(self.root)
+        plan_frame.pack(pady=(0, 5))
+
+        self.save_plan_button = ttk.Button(
+            plan_frame,
+            text="💾 Сохранить план",
+            command=self._save_plan,
+            width=20
+        )
+        self.save_plan_button.pack(side="left", padx=5)
+
+        self.run_plan_button = ttk.Button(
+            plan_frame,
+            text="📂 Выполнить план",
+            command=self._run_plan_thread,
+            width=20
+        )
+        self.run_plan_button.pack(side="left", padx=5)
+
+        self.undo_button = ttk.Button(
+            plan_frame,
+            text="↩️ Отменить запуск",
+            command=self._undo_run_thread,
+            width=20
+        )
+        self.undo_button.pack(side="left", padx=5)
+
     def _create_log_section(self) -> None:
         """Создает секцию логов"""
         log_frame = ttk.LabelFrame(self.root, text="Лог выполнения")
@@ -748,6 +3878,20 @@ class FileRenamerGUI:
         if filename:
             self.table_path.set(filename)
             self._log(f"📋 Выбрана таблица: {os.path.basename(filename)}")
+            self._load_sheet_list(filename)
+
+    def _load_sheet_list(self, filename: str) -> None:
+        """Заполняет список листов по метаданным книги"""
+        try:
+            sheets = list_sheets(filename)
+        except Exception as e:
+            sheets = []
+            self._log(f"⚠️ Не удалось получить список листов: {str(e)}")
+
+        self.sheet_combo.config(values=sheets)
+        self.sheet_var.set(sheets[0] if sheets else '')
+        if len(sheets) > 1:
+            self._log(f"📑 Листов в книге: {len(sheets)}")
 
     def _browse_folder(self) -> None:
         """Выбор папки с файлами"""
@@ -845,14 +3989,31 @@ class FileRenamerGUI:
             self.preview_button.config(state="disabled")
             self.status_var.set(f"Выполняется {mode_text.lower()}...")
 
+            if self.streaming_var.get() and not self.recursive_var.get():
+                self._run_streaming(table, folder, dry_run)
+                return
+
             # Загрузка таблицы
             self._log("\n📊 Загрузка таблицы...")
-            self.table_processor = TableProcessor(table)
+            self.table_processor = TableProcessor(
+                table,
+                cache=self.table_cache,
+                sheet=self.sheet_var.get() or None,
+                column=self.column_var.get(),
+                has_header=self.HEADER_MODES[self.header_var.get()]
+            )
             analysis = self.table_processor.analyze_content()
 
+            if self.table_processor.has_header:
+                self._log(f"   📋 Строка заголовка пропущена: '{self.table_processor.header}'")
             self._log(f"   Всего строк: {analysis['total_rows']}")
             self._log(f"   Действительных имен: {analysis['valid_count']}")
 
+            if analysis['rejected']:
+                self._log(f"   ⚠️ Отклонено имен: {len(analysis['rejected'])}")
+                for row, reason in analysis['rejected'][:3]:
+                    self._log(f"      строка {row}: {reason}")
+
             if analysis['valid_count'] == 0:
                 messagebox.showerror("Ошибка", "В таблице нет действительных имен!")
                 return
@@ -868,9 +4029,19 @@ class FileRenamerGUI:
                 for name, count in list(analysis['duplicates_original'].items())[:5]:
                     self._log(f"   '{name}' - встречается {count} раз")
 
-            # Загрузка файлов
+            if self.recursive_var.get():
+                self._run_recursive(analysis['valid_names'], folder, dry_run)
+                return
+
+            # Загрузка файлов: для той же папки план пересчитается инкрементально
             self._log("\n📁 Анализ папки с файлами...")
-            self.file_renamer = FileRenamer(folder, dry_run=dry_run)
+            order = self.FILE_ORDER_MODES[self.order_var.get()]
+            if self.file_renamer is not None and self.file_renamer.folder_path == Path(folder):
+                self.file_renamer.dry_run = dry_run
+                self.file_renamer.order = order
+                self.file_renamer.rescan()
+            else:
+                self.file_renamer = FileRenamer(folder, dry_run=dry_run, order=order)
 
             self._log(f"   Всего файлов: {len(self.file_renamer.files)}")
 
@@ -882,24 +4053,23 @@ class FileRenamerGUI:
 
             # Подготовка операций
             self._log("\n🔄 Подготовка операций переименования...")
-            names = analysis['valid_names'].tolist()
+            names = analysis['valid_names']
             operations = self.file_renamer.prepare_operations(names)
 
-            pending_ops = [op for op in operations if op.status == 'pending']
-            error_ops = [op for op in operations if op.status == 'error']
-            skipped_ops = [op for op in operations if op.status == 'skipped']
+            error_count = operations.count('error')
+            skipped_count = operations.count('skipped')
 
-            self._log(f"   Будет переименовано: {len(pending_ops)}")
-            if error_ops:
-                self._log(f"   ⚠️ Ошибок: {len(error_ops)}")
-            if skipped_ops:
-                self._log(f"   ⏹️ Пропущено: {len(skipped_ops)}")
+            self._log(f"   Будет переименовано: {operations.count('pending')}")
+            if error_count:
+                self._log(f"   ⚠️ Ошибок: {error_count}")
+            if skipped_count:
+                self._log(f"   ⏹️ Пропущено: {skipped_count}")
 
             # Показываем примеры переименования
             self._log("\n📋 Примеры переименования:")
             for op in operations[:5]:
                 if op.status == 'pending':
-                    self._log(f"   [{op.index:3d}] {op.old_path.name}")
+                    self._log(f"   [{op.index:3d}] {op.old_name}")
                     self._log(f"         → {op.new_name}")
                     if op.is_duplicate:
                         self._log(f"         🔄 Дубликат #{op.duplicate_number}")
@@ -911,22 +4081,19 @@ class FileRenamerGUI:
             stats = self.file_renamer.execute_operations()
 
             # Детальный вывод результатов
-            success_count = 0
-            for op in operations:
-                if op.status == 'success' and op.new_name:
-                    success_count += 1
-                    prefix = "✅ [DRY]" if dry_run else "✅"
-                    self._log(f"{prefix} [{op.index:3d}] {op.old_path.name} → {op.new_name}")
-                    if success_count >= 10 and len(operations) > 15:
-                        remaining = len([o for o in operations if o.status == 'success']) - success_count
-                        if remaining > 0:
-                            self._log(f"   ... и еще {remaining} файлов успешно обработано")
-                        break
-                elif op.status == 'error':
-                    self._log(f"❌ [{op.index:3d}] {op.old_path.name} - {op.error_message}")
-                elif op.status == 'skipped':
-                    if skipped_ops.index(op) < 3:  # Показываем только первые 3
-                        self._log(f"⏹️ [{op.index:3d}] {op.old_path.name} - пропущен")
+            success_ops = operations.by_status('success')
+            shown = success_ops[:10] if len(operations) > 15 else success_ops
+            prefix = "✅ [DRY]" if dry_run else "✅"
+            for op in shown:
+                self._log(f"{prefix} [{op.index:3d}] {op.old_name} → {op.new_name}")
+            if len(success_ops) > len(shown):
+                self._log(f"   ... и еще {len(success_ops) - len(shown)} файлов успешно обработано")
+
+            for op in operations.by_status('error'):
+                self._log(f"❌ [{op.index:3d}] {op.old_name} - {op.error_message}")
+
+            for op in operations.by_status('skipped')[:3]:  # Показываем только первые 3
+                self._log(f"⏹️ [{op.index:3d}] {op.old_name} - пропущен")
 
             # Итоги
             self._log("\n" + "="*70)
@@ -985,6 +4152,361 @@ class FileRenamerGUI:
             self.run_button.config(state="normal")
             self.preview_button.config(state="normal")
 
+    def _check_interrupted_runs(self) -> None:
+        """Предлагает завершить запуски, прерванные сбоем (по журналам)"""
+        try:
+            reports = recover_journals()
+            pending = sum(report.pending for report in reports)
+            if reports and not pending:
+                # Все шаги выполнены - журналы только отмечаются завершенными
+                recover_journals(finish=True)
+        except Exception as e:
+            self.logger.error(f"Ошибка проверки журналов: {str(e)}", exc_info=True)
+            return
+
+        if not pending:
+            return
+
+        reports = [report for report in reports if report.pending]
+        self._log(f"\n⚠️ Найдены прерванные запуски: {len(reports)}, "
+                  f"не выполнено переименований: {pending}")
+        for report in reports:
+            self._log(f"   {report.path.name}: выполнено {report.done} из {report.steps}")
+
+        if not messagebox.askyesno(
+            "Прерванный запуск",
+            f"Предыдущее переименование было прервано.\n\n"
+            f"Не выполнено переименований: {pending}\n\n"
+            f"Завершить его сейчас?"
+        ):
+            self._log("   Прерванные запуски оставлены (вопрос повторится при следующем запуске)")
+            return
+
+        finished = recover_journals(finish=True)
+        done = sum(report.finished for report in finished)
+        conflicts = [conflict for report in finished for conflict in report.conflicts]
+        self._log(f"✅ Завершено переименований: {done}")
+        for conflict in conflicts[:10]:
+            self._log(f"❌ Конфликт: {conflict}")
+        if conflicts:
+            self._log(f"   Всего конфликтов: {len(conflicts)} (файлы изменены после сбоя)")
+
+    def _save_plan(self) -> None:
+        """Сохраняет план последнего запуска в файл"""
+        renamer = self.file_renamer
+        if renamer is None or self.streaming_var.get() or not len(renamer.operations):
+            messagebox.showerror("Ошибка", "Сначала выполните предпросмотр (без потокового режима)!")
+            return
+
+        plan_file = filedialog.asksaveasfilename(
+            title="Сохранить план",
+            defaultextension=".jsonl",
+            filetypes=CONFIG['plan_formats']
+        )
+        if not plan_file:
+            return
+
+        try:
+            pending = renamer.save_plan(plan_file)
+            self._log(f"💾 План сохранен: {os.path.basename(plan_file)} (к выполнению: {pending})")
+        except Exception as e:
+            self._log(f"❌ Ошибка сохранения плана: {str(e)}")
+            messagebox.showerror("Ошибка", str(e))
+
+    def _run_plan_thread(self) -> None:
+        """Выбор сохраненного плана и его выполнение в отдельном потоке"""
+        plan_file = filedialog.askopenfilename(
+            title="Выберите план переименования",
+            filetypes=CONFIG['plan_formats']
+        )
+        if not plan_file:
+            return
+
+        # Папка могла быть перенесена или диск подключен под другой буквой:
+        # спрашиваем новое место до запуска потока (диалоги - только здесь)
+        folder = None
+        try:
+            recorded = FileRenamer.read_plan_header(plan_file)['folder']
+        except (PlanError, OSError, KeyError) as e:
+            self._log(f"❌ Ошибка плана: {str(e)}")
+            messagebox.showerror("Ошибка плана", str(e))
+            return
+        if not os.path.isdir(recorded):
+            if not messagebox.askyesno(
+                "Папка не найдена",
+                f"Папка из плана не найдена:\n{recorded}\n\n"
+                f"Указать, где теперь находятся файлы?"
+            ):
+                return
+            folder = filedialog.askdirectory(title="Выберите папку с файлами плана")
+            if not folder:
+                return
+            self._log(f"📁 Папка плана заменена: {recorded} → {folder}")
+
+        thread = threading.Thread(target=self._run_plan, args=(plan_file, folder), daemon=True)
+        thread.start()
+
+    def _run_plan(self, plan_file: str, folder: Optional[str] = None) -> None:
+        """Выполняет сохраненный план без повторного планирования"""
+        dry_run = self.dry_run_var.get()
+
+        self._log("\n" + "="*70)
+        self._log(f"📂 ВЫПОЛНЕНИЕ ПЛАНА: {os.path.basename(plan_file)}")
+        self._log("="*70)
+
+        try:
+            self.run_plan_button.config(state="disabled")
+            self.run_button.config(state="disabled")
+
+            self.file_renamer = FileRenamer.load_plan(plan_file, dry_run=dry_run, folder=folder)
+            operations = self.file_renamer.operations
+            self._log(f"   Папка: {self.file_renamer.folder_path}")
+            self._log(f"   Операций в плане: {len(operations)}")
+            self._log(f"   Будет переименовано: {operations.count('pending')}")
+
+            if not messagebox.askyesno(
+                "Подтверждение",
+                f"Выполнить план {os.path.basename(plan_file)}?\n\n"
+                f"Будет переименовано: {operations.count('pending')}\n"
+                f"{'Режим предпросмотра - файлы НЕ будут изменены.' if dry_run else 'Файлы будут переименованы!'}"
+            ):
+                return
+
+            stats = self.file_renamer.execute_operations()
+
+            for op in operations.by_status('error')[:10]:
+                self._log(f"❌ [{op.index:3d}] {op.old_name} - {op.error_message}")
+
+            self._log(f"✅ Успешно: {stats['success']}")
+            self._log(f"❌ Ошибок: {stats['error']}")
+            self._log(f"⏹️ Пропущено: {stats['skipped']}")
+            if dry_run:
+                self._log("\n🔍 РЕЖИМ ПРЕДПРОСМОТРА - файлы не были изменены")
+
+            self.status_var.set(
+                f"План выполнен! Успешно: {stats['success']}, "
+                f"Ошибок: {stats['error']}, "
+                f"Пропущено: {stats['skipped']}"
+            )
+
+        except PlanError as e:
+            self._log(f"\n❌ Ошибка плана: {str(e)}")
+            messagebox.showerror("Ошибка плана", str(e))
+
+        except Exception as e:
+            self._log(f"\n❌ Критическая ошибка: {str(e)}")
+            self.logger.error(f"Критическая ошибка: {str(e)}", exc_info=True)
+            messagebox.showerror("Критическая ошибка", f"Произошла ошибка:\n\n{str(e)}")
+
+        finally:
+            self.run_plan_button.config(state="normal")
+            self.run_button.config(state="normal")
+
+    def _undo_run_thread(self) -> None:
+        """Выбор журнала запуска и его отмена в отдельном потоке"""
+        journal_dir = Path(CONFIG['journal']['directory'])
+        journal_file = filedialog.askopenfilename(
+            title="Выберите журнал запуска для отмены",
+            initialdir=str(journal_dir) if journal_dir.is_dir() else None,
+            filetypes=CONFIG['journal_formats']
+        )
+        if journal_file:
+            thread = threading.Thread(target=self._undo_run, args=(journal_file,), daemon=True)
+            thread.start()
+
+    def _undo_run(self, journal_file: str) -> None:
+        """Отменяет запуск по журналу: файлы получают прежние имена"""
+        dry_run = self.dry_run_var.get()
+
+        self._log("\n" + "="*70)
+        self._log(f"↩️ ОТМЕНА ЗАПУСКА: {os.path.basename(journal_file)}")
+        self._log("="*70)
+
+        try:
+            self.undo_button.config(state="disabled")
+            self.run_button.config(state="disabled")
+
+            workers = CONFIG['undo']['workers']
+            undo = load_undo(journal_file, dry_run=dry_run, workers=workers)
+            pending = undo.count('pending')
+            conflicts = undo.count('error')
+            self._log(f"   Папок: {len(undo.renamers)}")
+            self._log(f"   Будет возвращено имен: {pending}")
+
+            root = Path(undo.root_path)
+            if conflicts:
+                self._log(f"   ⚠️ Конфликтов: {conflicts}")
+                shown = 0
+                for renamer in undo.renamers:
+                    for op in renamer.operations.by_status('error')[:10 - shown]:
+                        self._log(f"❌ {op.old_path.relative_to(root)} - {op.error_message}")
+                        shown += 1
+
+            if not pending:
+                messagebox.showinfo("Отмена запуска", "Нечего отменять: все файлы изменены или уже на месте.")
+                return
+
+            if not messagebox.askyesno(
+                "Подтверждение",
+                f"Отменить запуск {os.path.basename(journal_file)}?\n\n"
+                f"Будет возвращено имен: {pending}\n"
+                f"Конфликтов (не трогаются): {conflicts}\n\n"
+                f"{'Режим предпросмотра - файлы НЕ будут изменены.' if dry_run else 'Файлы будут переименованы обратно!'}"
+            ):
+                return
+
+            started = time.perf_counter()
+            stats = undo.execute_operations(workers if len(undo.renamers) == 1 else 1)
+            elapsed = time.perf_counter() - started
+
+            self._log(f"✅ Возвращено: {stats['success']}")
+            self._log(f"❌ Ошибок: {stats['error']}")
+            self._log(f"⏱️ Время: {elapsed:.1f} с")
+            if dry_run:
+                self._log("\n🔍 РЕЖИМ ПРЕДПРОСМОТРА - файлы не были изменены")
+
+            self.status_var.set(
+                f"Запуск отменен! Возвращено: {stats['success']}, Ошибок: {stats['error']}"
+            )
+
+        except JournalError as e:
+            self._log(f"\n❌ Ошибка журнала: {str(e)}")
+            messagebox.showerror("Ошибка журнала", str(e))
+
+        except Exception as e:
+            self._log(f"\n❌ Критическая ошибка: {str(e)}")
+            self.logger.error(f"Критическая ошибка: {str(e)}", exc_info=True)
+            messagebox.showerror("Критическая ошибка", f"Произошла ошибка:\n\n{str(e)}")
+
+        finally:
+            self.undo_button.config(state="normal")
+            self.run_button.config(state="normal")
+
+    def _run_streaming(self, table: str, folder: str, dry_run: bool) -> None:
+        """Потоковый режим: таблица читается и выполняется порциями"""
+        self._log("\n⚡ Потоковый режим: таблица читается порциями")
+        self._log("   Переименования на имена файлов из следующих порций не выполняются "
+                  "(в обычном режиме они выстраиваются в цепочки)")
+
+        self._log("\n📁 Анализ папки с файлами...")
+        self.file_renamer = FileRenamer(
+            folder, dry_run=dry_run, order=self.FILE_ORDER_MODES[self.order_var.get()]
+        )
+        self._log(f"   Всего файлов: {len(self.file_renamer.files)}")
+
+        self._log(f"\n{'🔍 ПРЕДПРОСМОТР' if dry_run else '⚡ ВЫПОЛНЕНИЕ'}:")
+        self._log("-" * 70)
+
+        analyzer = TableAnalyzer(keep_names=False)
+        started = time.perf_counter()
+        name_chunks = iter_table_names(
+            table,
+            analyzer=analyzer,
+            sheet=self.sheet_var.get() or None,
+            column=self.column_var.get(),
+            has_header=self.HEADER_MODES[self.header_var.get()]
+        )
+        stats = self.file_renamer.execute_streaming(name_chunks)
+        elapsed = time.perf_counter() - started
+
+        self._log(f"   Прочитано строк таблицы: {analyzer.total_rows}")
+        self._log(f"   Действительных имен: {analyzer.valid_count}")
+        if analyzer.rejected:
+            self._log(f"   ⚠️ Отклонено имен: {len(analyzer.rejected)}")
+
+        for op in self.file_renamer.operations[:10]:
+            self._log(f"❌ [{op.index:3d}] {op.old_name} - {op.error_message}")
+
+        self._log("\n" + "="*70)
+        self._log("🏁 ИТОГИ")
+        self._log("="*70)
+        self._log(f"✅ Успешно: {stats['success']}")
+        self._log(f"❌ Ошибок: {stats['error']}")
+        self._log(f"⏹️ Пропущено: {stats['skipped']}")
+        self._log(f"⏱️ Время: {elapsed:.1f} с")
+
+        if dry_run:
+            self._log("\n🔍 РЕЖИМ ПРЕДПРОСМОТРА - файлы не были изменены")
+
+        self.status_var.set(
+            f"Готово! Успешно: {stats['success']}, "
+            f"Ошибок: {stats['error']}, "
+            f"Пропущено: {stats['skipped']}"
+        )
+
+        messagebox.showinfo(
+            "Готово",
+            f"{'🔍 ПРЕДПРОСМОТР ЗАВЕРШЕН' if dry_run else '🏁 ПЕРЕИМЕНОВАНИЕ ЗАВЕРШЕНО'}\n\n"
+            f"✅ Успешно: {stats['success']}\n"
+            f"❌ Ошибок: {stats['error']}\n"
+            f"⏹️ Пропущено: {stats['skipped']}"
+        )
+
+    def _run_recursive(self, names: List[str], folder: str, dry_run: bool) -> None:
+        """Рекурсивный режим: все вложенные папки обрабатываются параллельно"""
+        mapping = self.RECURSIVE_MAPPINGS[self.mapping_var.get()]
+        self._log(f"\n📂 Рекурсивный режим: {self.mapping_var.get().lower()}")
+
+        # План дерева не сохраняется как план одной папки
+        self.file_renamer = None
+
+        self._log("\n📁 Обход папок...")
+        started = time.perf_counter()
+        tree = TreeRenamer(
+            folder, dry_run=dry_run, mapping=mapping,
+            order=self.FILE_ORDER_MODES[self.order_var.get()]
+        )
+        elapsed = time.perf_counter() - started
+        self._log(
+            f"   Папок: {tree.folder_count} за {elapsed:.1f} с "
+            f"({tree.folder_count / elapsed if elapsed > 0 else 0:.0f} папок/с)"
+        )
+        self._log(f"   Папок с файлами: {len(tree.renamers)}")
+        self._log(f"   Всего файлов: {tree.total_files}")
+
+        self._log("\n🔄 Подготовка операций переименования...")
+        tree.prepare_operations(names)
+        self._log(f"   Будет переименовано: {tree.count('pending')}")
+        if tree.count('error'):
+            self._log(f"   ⚠️ Ошибок: {tree.count('error')}")
+        if tree.count('skipped'):
+            self._log(f"   ⏹️ Пропущено: {tree.count('skipped')}")
+
+        self._log(f"\n{'🔍 ПРЕДПРОСМОТР' if dry_run else '⚡ ВЫПОЛНЕНИЕ'}:")
+        self._log("-" * 70)
+        stats = tree.execute_operations()
+
+        root = Path(folder)
+        for renamer in tree.renamers:
+            for op in renamer.operations.by_status('error'):
+                relative = op.old_path.relative_to(root)
+                self._log(f"❌ [{op.index:3d}] {relative} - {op.error_message}")
+
+        self._log("\n" + "="*70)
+        self._log("🏁 ИТОГИ")
+        self._log("="*70)
+        self._log(f"✅ Успешно: {stats['success']}")
+        self._log(f"❌ Ошибок: {stats['error']}")
+        self._log(f"⏹️ Пропущено: {stats['skipped']}")
+
+        if dry_run:
+            self._log("\n🔍 РЕЖИМ ПРЕДПРОСМОТРА - файлы не были изменены")
+
+        self.status_var.set(
+            f"Готово! Успешно: {stats['success']}, "
+            f"Ошибок: {stats['error']}, "
+            f"Пропущено: {stats['skipped']}"
+        )
+
+        messagebox.showinfo(
+            "Готово",
+            f"{'🔍 ПРЕДПРОСМОТР ЗАВЕРШЕН' if dry_run else '🏁 ПЕРЕИМЕНОВАНИЕ ЗАВЕРШЕНО'}\n\n"
+            f"📂 Папок: {len(tree.renamers)}\n"
+            f"✅ Успешно: {stats['success']}\n"
+            f"❌ Ошибок: {stats['error']}\n"
+            f"⏹️ Пропущено: {stats['skipped']}"
+        )
+
     def _on_closing(self) -> None:
         """Обработчик закрытия окна"""
         if messagebox.askokcancel("Выход", "Вы уверены?"):
@@ -0,0 +1,74 @@
+"""Определение кодировки и чтение CSV"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import renamer_gui_v13_unified as renamer  # noqa: E402
+
+NAMES = ['Видео первое', 'Документ', 'Фото 3']
+
+
+class CsvEncodingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def read_names(self, data):
+        path = Path(self.tmp.name) / 'names.csv'
+        path.write_bytes(data)
+        return renamer.TableProcessor(str(path), has_header=False).get_valid_names()
+
+    def test_cyrillic_utf16_without_bom(self):
+        text = '\n'.join(NAMES) + '\n'
+        for encoding in ('utf-16-le', 'utf-16-be'):
+            with self.subTest(encoding=encoding):
+                data = text.encode(encoding)
+                self.assertEqual(renamer.detect_csv_format(data).encoding, encoding)
+                self.assertEqual(self.read_names(data), NAMES)
+
+    def test_ascii_utf16_without_bom(self):
+        data = 'video\ndocument\n'.encode('utf-16-le')
+        self.assertEqual(renamer.detect_csv_format(data).encoding, 'utf-16-le')
+
+    def test_8bit_encodings(self):
+        text = '\n'.join(NAMES) + '\n'
+        self.assertEqual(self.read_names(text.encode('utf-8')), NAMES)
+        self.assertEqual(self.read_names(text.encode('cp1251')), NAMES)
+
+
+class ChunkedScanTest(unittest.TestCase):
+
+    def test_chunks_match_single_pass(self):
+        rows = ['name 1', '...', '  ', 'name 2', 'name 1', '...', 'Фото'] * 5
+        with tempfile.TemporaryDirectory() as root:
+            path = Path(root) / 'names.csv'
+            path.write_text('\n'.join(rows) + '\n', encoding='utf-8')
+
+            analyses = {}
+            feeds = {}
+            feed = renamer.TableAnalyzer.feed
+            for chunk_size in (3, 1000):
+                pipeline = dict(renamer.CONFIG['pipeline'], chunk_size=chunk_size)
+                with mock.patch.dict(renamer.CONFIG, {'pipeline': pipeline}), \
+                        mock.patch.object(renamer.TableAnalyzer, 'feed', autospec=True,
+                                          side_effect=feed) as feed_mock:
+                    processor = renamer.TableProcessor(str(path), has_header=False)
+                analyses[chunk_size] = (processor.analyze_content(), processor.get_preview())
+                feeds[chunk_size] = [len(call.args[1]) for call in feed_mock.call_args_list]
+
+        self.assertEqual(feeds, {3: [3] * 11 + [2], 1000: [35]})
+        self.assertEqual(analyses[3], analyses[1000])
+        analysis = analyses[3][0]
+        self.assertEqual(analysis['valid_count'], 20)
+        # Номера отклоненных строк сквозные, а не внутри порции
+        self.assertEqual([row for row, _ in analysis['rejected']][:4], [2, 6, 9, 13])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,208 @@
+"""Выполнение плана: цепочки, циклы и журнал"""
+
+import errno
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import renamer_gui_v13_unified as renamer  # noqa: E402
+
+
+class ExecutionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        self.folder = self.root / 'files'
+        self.folder.mkdir()
+
+        journal = dict(renamer.CONFIG['journal'], enabled=True,
+                       directory=str(self.root / 'journals'))
+        patcher = mock.patch.dict(renamer.CONFIG, {'journal': journal})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_files(self, files):
+        for name, content in files.items():
+            (self.folder / name).write_text(content, encoding='utf-8')
+
+    def folder_contents(self):
+        return {path.name: path.read_text(encoding='utf-8')
+                for path in self.folder.iterdir()}
+
+    def plan(self, names):
+        file_renamer = renamer.FileRenamer(str(self.folder))
+        file_renamer.prepare_operations(names)
+        return file_renamer
+
+
+class SwapTest(ExecutionTestCase):
+
+    def test_journal_error_after_rename_keeps_both_files(self):
+        self.make_files({'a_TZ.txt': 'A', 'b_TZ.txt': 'B'})
+        file_renamer = self.plan(['b', 'a'])
+
+        original_done = renamer.RenameJournal.done
+        calls = []
+
+        def done(journal, step, stamp=None):
+            calls.append(step)
+            if len(calls) == 2:
+                raise OSError(errno.ENOSPC, 'No space left on device')
+            original_done(journal, step, stamp)
+
+        with mock.patch.object(renamer.RenameJournal, 'done', done):
+            file_renamer.execute_operations()
+
+        self.assertEqual(self.folder_contents(), {'a_TZ.txt': 'B', 'b_TZ.txt': 'A'})
+
+    def test_rollback_stops_at_occupied_name(self):
+        self.make_files({'a_TZ.txt': 'A', 'b_TZ.txt': 'B'})
+        file_renamer = self.plan(['b', 'a'])
+
+        original_rename = renamer.FileRenamer._rename
+
+        def rename(self_, source, target):
+            if target == 'b_TZ.txt' and source != 'a_TZ.txt':
+                # Последний шаг цикла не удался, а освобожденное имя
+                # тем временем занял посторонний файл
+                (self.folder / 'b_TZ.txt').write_text('X', encoding='utf-8')
+                raise PermissionError(errno.EACCES, 'Permission denied')
+            original_rename(self_, source, target)
+
+        with mock.patch.object(renamer.FileRenamer, '_rename', rename):
+            file_renamer.execute_operations()
+
+        contents = self.folder_contents()
+        self.assertEqual(sorted(contents.values()), ['A', 'B', 'X'])
+        self.assertEqual(contents['b_TZ.txt'], 'X')
+
+
+class CycleUndoTest(ExecutionTestCase):
+    """Обмен, цикл из трех имен и цепочка: выполнение и отмена по журналу"""
+
+    FILES = {
+        'a_TZ.txt': 'A', 'b_TZ.txt': 'B',                       # обмен
+        'c_TZ.txt': 'C', 'd_TZ.txt': 'D', 'e_TZ.txt': 'E',      # цикл c->d->e->c
+        'f.txt': 'F', 'g_TZ.txt': 'G',                           # цепочка f->g, g->h
+        'plain.txt': 'P'
+    }
+    NAMES = ['b', 'a', 'd', 'e', 'c', 'g', 'h', 'p']
+    EXPECTED = {
+        'b_TZ.txt': 'A', 'a_TZ.txt': 'B',
+        'd_TZ.txt': 'C', 'e_TZ.txt': 'D', 'c_TZ.txt': 'E',
+        'g_TZ.txt': 'F', 'h_TZ.txt': 'G',
+        'p_TZ.txt': 'P'
+    }
+
+    def round_trip(self, workers):
+        self.make_files(self.FILES)
+        file_renamer = self.plan(self.NAMES)
+        # Порядок файлов - по имени, таблица сопоставлена ему построчно
+        self.assertEqual(file_renamer.file_names, sorted(self.FILES))
+
+        stats = file_renamer.execute_operations(workers=workers)
+        self.assertEqual(stats['success'], len(self.FILES))
+        self.assertEqual(self.folder_contents(), self.EXPECTED)
+
+        _, undo_stats = renamer.undo_run(str(file_renamer.last_journal), workers=workers)
+        self.assertEqual(undo_stats['success'], len(self.FILES))
+        self.assertEqual(self.folder_contents(), self.FILES)
+
+    def test_sequential_round_trip(self):
+        self.round_trip(workers=1)
+
+    def test_parallel_round_trip(self):
+        self.round_trip(workers=4)
+
+    def test_undo_skips_changed_file(self):
+        self.make_files(self.FILES)
+        file_renamer = self.plan(self.NAMES)
+        file_renamer.execute_operations()
+        (self.folder / 'p_TZ.txt').write_text('changed', encoding='utf-8')
+
+        _, undo_stats = renamer.undo_run(str(file_renamer.last_journal))
+        self.assertEqual(undo_stats['error'], 1)
+        contents = self.folder_contents()
+        self.assertEqual(contents['p_TZ.txt'], 'changed')
+        self.assertEqual(contents['a_TZ.txt'], 'A')
+
+
+class StreamingTest(ExecutionTestCase):
+
+    def run_both(self, files, names, chunk_size):
+        self.make_files(files)
+        file_renamer = self.plan(names)
+        batch_stats = file_renamer.execute_operations()
+        batch = self.folder_contents()
+
+        for path in self.folder.iterdir():
+            path.unlink()
+        self.make_files(files)
+        streaming_stats = renamer.FileRenamer(str(self.folder)).execute_streaming(
+            [names], chunk_size=chunk_size
+        )
+        self.assertEqual(self.folder_contents(), batch)
+        self.assertEqual(streaming_stats['success'], batch_stats['success'])
+
+    def test_swap_matches_batch(self):
+        self.run_both({'a_TZ.txt': 'A', 'b_TZ.txt': 'B'}, ['b', 'a'], chunk_size=None)
+
+    def test_chain_inside_chunk_matches_batch(self):
+        self.run_both({'a_TZ.txt': 'A', 'b_TZ.txt': 'B', 'c.txt': 'C'},
+                      ['b', 'c', 'x'], chunk_size=None)
+
+    def test_names_freed_by_previous_chunks(self):
+        self.run_both({'1_TZ.txt': '1', '2_TZ.txt': '2', '3_TZ.txt': '3'},
+                      ['0', '1', '2'], chunk_size=1)
+
+
+class PlanFolderTest(ExecutionTestCase):
+
+    def save_plan(self):
+        self.make_files({'1.txt': '1', '2.txt': '2'})
+        file_renamer = renamer.FileRenamer(str(self.folder), dry_run=True)
+        file_renamer.prepare_operations(['a', 'b'])
+        file_renamer.execute_operations()
+        plan_path = self.root / 'plan.jsonl'
+        self.assertEqual(file_renamer.save_plan(str(plan_path)), 2)
+        return plan_path
+
+    def test_plan_runs_in_moved_folder(self):
+        plan_path = self.save_plan()
+        # Копия с теми же размерами и временем изменения, но другими inode
+        moved = self.root / 'moved'
+        shutil.copytree(self.folder, moved)
+        shutil.rmtree(self.folder)
+
+        header = renamer.FileRenamer.read_plan_header(str(plan_path))
+        self.assertFalse(Path(header['folder']).exists())
+        with self.assertRaises(FileNotFoundError):
+            renamer.FileRenamer.load_plan(str(plan_path))
+
+        file_renamer = renamer.FileRenamer.load_plan(str(plan_path), folder=str(moved))
+        self.assertEqual(file_renamer.operations.count('pending'), 2)
+        stats = file_renamer.execute_operations()
+        self.assertEqual(stats['success'], 2)
+        self.assertEqual(sorted(path.name for path in moved.iterdir()),
+                         ['a_TZ.txt', 'b_TZ.txt'])
+
+    def test_moved_folder_still_detects_changed_file(self):
+        plan_path = self.save_plan()
+        moved = self.root / 'moved'
+        shutil.copytree(self.folder, moved)
+        (moved / '2.txt').write_text('changed', encoding='utf-8')
+
+        file_renamer = renamer.FileRenamer.load_plan(str(plan_path), folder=str(moved))
+        self.assertEqual(file_renamer.operations.count('pending'), 1)
+        self.assertEqual(file_renamer.operations.count('error'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
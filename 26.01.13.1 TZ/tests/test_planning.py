@@ -0,0 +1,80 @@
+"""Инкрементальное перепланирование совпадает с планом с нуля"""
+
+import logging
+import random
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import renamer_gui_v13_unified as renamer  # noqa: E402
+
+POOL = ['a', 'b', 'c', 'q', 'a (1) .', 'd', 'e']
+
+
+def snapshot(operations):
+    return [(op.index, op.old_name, op.new_name, op.status, op.error_message,
+             op.duplicate_number) for op in operations]
+
+
+class IncrementalPlanTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.folder = Path(tmp.name)
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+    def fresh_plan(self, names):
+        file_renamer = renamer.FileRenamer(str(self.folder), dry_run=True,
+                                           collision_mode='casefold')
+        return snapshot(file_renamer.prepare_operations(names))
+
+    def test_random_edits_match_fresh_plan(self):
+        for i in range(300):
+            (self.folder / f'f{i:04d}.txt').write_text('x')
+        (self.folder / 'q_TZ.txt').write_text('x')
+
+        rnd = random.Random(7)
+        names = [rnd.choice(POOL) + str(rnd.randint(0, 3)) if rnd.random() < 0.5
+                 else rnd.choice(POOL) for _ in range(280)]
+        file_renamer = renamer.FileRenamer(str(self.folder), dry_run=True,
+                                           collision_mode='casefold')
+        file_renamer.prepare_operations(names)
+        file_renamer.execute_operations()
+
+        for edit in range(300):
+            kind = rnd.random()
+            names = list(names)
+            if kind < 0.5:
+                names[rnd.randrange(len(names))] = rnd.choice(POOL)
+            elif kind < 0.6:
+                names.insert(rnd.randrange(len(names)), rnd.choice(POOL))
+            elif kind < 0.7:
+                del names[rnd.randrange(len(names))]
+            elif kind < 0.8:
+                (self.folder / f'g{edit}.txt').write_text('x')
+                file_renamer.rescan()
+            elif kind < 0.9:
+                # Занимаем или освобождаем итоговое имя файлом или папкой
+                path = self.folder / (rnd.choice(POOL).split(' ')[0] + '_TZ.txt')
+                if path.is_dir():
+                    path.rmdir()
+                elif path.exists():
+                    path.unlink()
+                elif rnd.random() < 0.5:
+                    path.mkdir()
+                else:
+                    path.write_text('x')
+                file_renamer.rescan()
+
+            incremental = snapshot(file_renamer.prepare_operations(names))
+            file_renamer.execute_operations()
+            self.assertEqual(incremental, self.fresh_plan(names), f"правка {edit}")
+
+
+if __name__ == '__main__':
+    unittest.main()
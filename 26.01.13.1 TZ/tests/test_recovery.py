@@ -0,0 +1,95 @@
+"""Восстановление запуска, прерванного сбоем процесса (SIGKILL)"""
+
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+MODULE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(MODULE_DIR))
+
+import renamer_gui_v13_unified as renamer  # noqa: E402
+
+COUNT = 400
+
+# Дочерний процесс: медленное выполнение (задержка перед каждым rename),
+# половина файлов меняется попарно (циклы), остальные сдвигаются цепочкой
+CHILD = """
+import logging, sys, time
+sys.path.insert(0, sys.argv[1])
+import renamer_gui_v13_unified as renamer
+logging.disable(logging.CRITICAL)
+folder, journals, workers, count = sys.argv[2], sys.argv[3], int(sys.argv[4]), int(sys.argv[5])
+renamer.CONFIG['journal'].update(enabled=True, directory=journals)
+
+class SlowRenamer(renamer.FileRenamer):
+    def _rename(self, source, target):
+        time.sleep(0.002)
+        super()._rename(source, target)
+
+file_renamer = SlowRenamer(folder)
+file_renamer.prepare_operations(
+    [f'{i ^ 1:04d}' for i in range(count // 2)] + [f'{i + 1:04d}' for i in range(count // 2, count)]
+)
+print('planned', flush=True)
+file_renamer.execute_operations(workers=workers)
+"""
+
+
+def expected_contents():
+    contents = {f'{i ^ 1:04d}_TZ.txt': str(i) for i in range(COUNT // 2)}
+    contents.update({f'{i + 1:04d}_TZ.txt': str(i) for i in range(COUNT // 2, COUNT)})
+    return contents
+
+
+@unittest.skipIf(os.name != 'posix', "нужен SIGKILL")
+class CrashRecoveryTest(unittest.TestCase):
+
+    def run_and_kill(self, workers, delay):
+        with tempfile.TemporaryDirectory() as root:
+            folder = Path(root, 'files')
+            journals = Path(root, 'journals')
+            folder.mkdir()
+            for i in range(COUNT):
+                (folder / f'{i:04d}_TZ.txt').write_text(str(i))
+
+            child = subprocess.Popen(
+                [sys.executable, '-B', '-c', CHILD, str(MODULE_DIR), str(folder),
+                 str(journals), str(workers), str(COUNT)],
+                stdout=subprocess.PIPE, text=True
+            )
+            try:
+                self.assertEqual(child.stdout.readline().strip(), 'planned')
+                time.sleep(delay)
+                child.send_signal(signal.SIGKILL)
+            finally:
+                child.wait()
+                child.stdout.close()
+
+            journal = dict(renamer.CONFIG['journal'], directory=str(journals))
+            with mock.patch.dict(renamer.CONFIG, {'journal': journal}):
+                reports = renamer.recover_journals(finish=True)
+                self.assertEqual(len(reports), 1, "запуск должен быть прерван")
+                self.assertEqual(renamer.recover_journals(), [])
+
+            contents = {path.name: path.read_text() for path in folder.iterdir()}
+            self.assertEqual(contents, expected_contents())
+
+    def test_sequential(self):
+        for delay in (0.1, 0.4):
+            with self.subTest(delay=delay):
+                self.run_and_kill(workers=1, delay=delay)
+
+    def test_parallel(self):
+        for delay in (0.05, 0.15):
+            with self.subTest(delay=delay):
+                self.run_and_kill(workers=8, delay=delay)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Импорт модуля не должен тянуть тяжелые зависимости и тормозить запуск GUI"""
+
+import json
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+MODULE_DIR = Path(__file__).resolve().parent.parent
+
+# Бюджет на импорт модуля в чистом процессе: pandas один стоит 0.5-1.5 с
+IMPORT_BUDGET_SECONDS = 0.5
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+started = time.perf_counter()
+import renamer_gui_v13_unified
+elapsed = time.perf_counter() - started
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+
+class StartupImportTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # -B: без __pycache__ в дереве; лучший из нескольких замеров
+        runs = []
+        for _ in range(3):
+            result = subprocess.run(
+                [sys.executable, '-B', '-c', PROBE, str(MODULE_DIR)],
+                capture_output=True, text=True, check=True
+            )
+            runs.append(json.loads(result.stdout.splitlines()[-1]))
+        cls.modules = set(runs[0]['modules'])
+        cls.elapsed = min(run['elapsed'] for run in runs)
+
+    def test_heavy_engines_not_imported(self):
+        for name in ('pandas', 'numpy', 'openpyxl', 'python_calamine'):
+            self.assertNotIn(name, self.modules)
+
+    def test_import_budget(self):
+        self.assertLess(self.elapsed, IMPORT_BUDGET_SECONDS,
+                        f"импорт занял {self.elapsed:.3f} с")
+
+
+if __name__ == '__main__':
+    unittest.main()
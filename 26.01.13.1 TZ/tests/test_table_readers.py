@@ -0,0 +1,65 @@
+"""Движки чтения Excel должны отдавать одинаковые значения столбца"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import renamer_gui_v13_unified as renamer  # noqa: E402
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover
+    openpyxl = None
+
+try:
+    import python_calamine
+except ImportError:  # pragma: no cover
+    python_calamine = None
+
+
+@unittest.skipIf(openpyxl is None or python_calamine is None,
+                 "нужны openpyxl и python-calamine")
+class CalamineMatchesOpenpyxlTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def make_sheet(self, cells):
+        path = Path(self.tmp.name) / 'table.xlsx'
+        workbook = openpyxl.Workbook()
+        for ref, value in cells.items():
+            workbook.active[ref] = value
+        workbook.save(path)
+        return path
+
+    def read(self, engine, path, column):
+        reader = renamer.get_table_reader(path, engine)
+        return list(reader.iter_column(path, None, renamer.parse_column_spec(column)))
+
+    def assert_engines_agree(self, path, column, expected_names):
+        calamine = self.read('calamine', path, column)
+        self.assertEqual(calamine, self.read('openpyxl', path, column))
+        self.assertEqual([value for value in calamine if value is not None], expected_names)
+
+    def test_empty_column_a(self):
+        path = self.make_sheet({'D2': 'a', 'D4': 'b', 'D5': '  ', 'D6': 'c', 'C3': 'side'})
+        self.assert_engines_agree(path, 'D', ['a', 'b', 'c'])
+        self.assert_engines_agree(path, 'C', ['side'])
+        self.assert_engines_agree(path, 'A', [])
+
+    def test_leading_empty_rows(self):
+        path = self.make_sheet({'A3': 'n1', 'A5': 'n2', 'B2': 'q'})
+        self.assert_engines_agree(path, 'A', ['n1', 'n2'])
+
+    def test_header_name_after_empty_columns(self):
+        path = self.make_sheet({'C1': 'Имя', 'C2': 'n1', 'C4': 'n2', 'E1': 'Другое', 'E2': 'x'})
+        self.assert_engines_agree(path, 'Имя', ['n1', 'n2'])
+        self.assert_engines_agree(path, 'другое', ['x'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,10 +20,10 @@ if errorlevel 1 (
 
 echo ✅ Python найден
 echo.
-echo Установка pandas и openpyxl...
+echo Установка openpyxl и python-calamine...
 echo.
 python -m pip install --upgrade pip
-python -m pip install pandas openpyxl
+python -m pip install openpyxl
 
 if errorlevel 1 (
     echo.
@@ -33,6 +33,13 @@ if errorlevel 1 (
     exit /b 1
 )
 
+rem python-calamine ускоряет чтение Excel, но не обязателен
+python -m pip install python-calamine
+if errorlevel 1 (
+    echo.
+    echo ⚠️ python-calamine не установлен - Excel будет читаться через openpyxl
+)
+
 cls
 echo.
 echo ╔══════════════════════════════════════════════════════════╗